@@ -1,8 +1,14 @@
 import base64
-from pyDes import des, CBC, PAD_PKCS5
 
+from des_backends import BLOCK_SIZE, get_backend, pkcs5_pad, pkcs5_unpad
+from des_container import DesContainer, is_container, write_container
 
-def image_cipher_des(path: str):
+CHUNK_SIZE = 1 << 20  # bytes per read in streaming mode (multiple of 8)
+
+
+def image_cipher_des(
+    path: str, backend: str = None, output_format: str = "base64"
+):
 
     print("=== DES image encryption ===")
 
@@ -12,21 +18,27 @@ def image_cipher_des(path: str):
 
     print(f"File size read: {len(data)} bytes")
 
-    # 2️ Convert the file bytes to an array/list of bits (0/1)
-    bits_list = [int(b) for byte in data for b in format(byte, "08b")]
-    print(f"Total bits: {len(bits_list)}")
-    print("First 64 bits: " + "".join(str(bit) for bit in bits_list[:64]))
+    # 2️ Show the file as bits (only the first 64 are needed for display)
+    print(f"Total bits: {len(data) * 8}")
+    print("First 64 bits: " + "".join(format(byte, "08b") for byte in data[:8]))
 
     # 3 Create the DES cipher
     key = input("Enter an 8-character key (e.g., 'key12345'): ")
     if len(key) != 8:
         raise ValueError("The key must be exactly 8 characters.")
 
+    if output_format == "container":
+        # Binary container: streamed from the file, no Base64 pass
+        write_container(path, "cipher.desc", key, backend=backend)
+        print("🔒 Container saved in 'cipher.desc'")
+        return "cipher.desc"
+
     iv = b"\x00" * 8  # initialization vector
-    cipher = des(key.encode("utf-8"), CBC, iv, padmode=PAD_PKCS5)
+    cipher = get_backend(backend)  # fastest installed DES implementation
+    print(f"DES backend: {cipher.name}")
 
-    # 4 Encrypt the original bytes
-    data_ciphered = cipher.encrypt(data)
+    # 4 Encrypt the original bytes (CBC with PKCS5 padding)
+    data_ciphered = cipher.encrypt_cbc(key.encode("utf-8"), iv, pkcs5_pad(data))
 
     # 5 Encode to Base64 for display or transport as text
     data_base64_encoded = base64.b64encode(data_ciphered).decode("utf-8")
@@ -43,7 +55,10 @@ def image_cipher_des(path: str):
 
 
 def image_decipher_des(
-    data_base64: str, key: str, output_path: str = "deciphered_image.png"
+    data_base64: str,
+    key: str,
+    output_path: str = "deciphered_image.png",
+    backend: str = None,
 ):
 
     if len(key) != 8:
@@ -51,13 +66,14 @@ def image_decipher_des(
 
     # 1️ Initialize the DES cipher
     iv = b"\x00" * 8  # Initialization vector
-    cipher = des(key.encode("utf-8"), CBC, iv, padmode=PAD_PKCS5)
+    cipher = get_backend(backend)
 
     # 2️ Decode from Base64 to encrypted bytes
     data_ciphered = base64.b64decode(data_base64)
 
     # 3️ Decrypt the bytes
-    data_deciphered = cipher.decrypt(data_ciphered)
+    data_padded = cipher.decrypt_cbc(key.encode("utf-8"), iv, data_ciphered)
+    data_deciphered = pkcs5_unpad(data_padded)
 
     # 4️ Save the decrypted image
     with open(output_path, "wb") as f:
@@ -67,30 +83,193 @@ def image_decipher_des(
     return data_deciphered
 
 
+def image_decipher_container(
+    container_path: str,
+    key: str,
+    output_path: str = "deciphered_image.png",
+    backend: str = None,
+):
+    """Decrypt a container written by image_cipher_des(output_format="container")."""
+    if len(key) != 8:
+        raise ValueError("The key must be exactly 8 characters (8 bytes).")
+
+    with DesContainer(container_path, backend) as container:
+        container.decrypt_to(output_path, key)
+
+    print(f"✅ Decrypted image saved as: {output_path}")
+    return output_path
+
+
+class _Base64Writer:
+    """Write Base64 text incrementally; bytes are encoded in groups of 3."""
+
+    def __init__(self, f):
+        self.f = f
+        self.pending = b""
+
+    def write(self, data: bytes):
+        data = self.pending + data
+        cut = len(data) - len(data) % 3
+        self.f.write(base64.b64encode(data[:cut]))
+        self.pending = data[cut:]
+
+    def close(self):
+        self.f.write(base64.b64encode(self.pending))
+        self.pending = b""
+
+
+def _read_base64_chunks(f, chunk_size: int):
+    """Yield decoded bytes from a Base64 file, decoding groups of 4 characters."""
+    pending = b""
+    while True:
+        chunk = f.read(chunk_size)
+        if not chunk:
+            break
+        data = pending + b"".join(chunk.split())  # ignore line breaks
+        cut = len(data) - len(data) % 4
+        yield base64.b64decode(data[:cut])
+        pending = data[cut:]
+    if pending:
+        yield base64.b64decode(pending)
+
+
+def _read_chunks(f, chunk_size: int):
+    while True:
+        chunk = f.read(chunk_size)
+        if not chunk:
+            break
+        yield chunk
+
+
+def _check_stream_args(key: str, chunk_size: int) -> bytes:
+    if len(key) != 8:
+        raise ValueError("The key must be exactly 8 characters (8 bytes).")
+    if chunk_size <= 0 or chunk_size % BLOCK_SIZE:
+        raise ValueError("chunk_size must be a positive multiple of 8")
+    return key.encode("utf-8")
+
+
+def encrypt_file_des(
+    input_path: str,
+    output_path: str,
+    key: str,
+    base64_output: bool = False,
+    chunk_size: int = CHUNK_SIZE,
+    backend: str = None,
+    iv: bytes = b"\x00" * 8,
+) -> int:
+    """Encrypt a file with DES-CBC reading one chunk at a time.
+    Memory use depends on chunk_size, not on the file size. The output is
+    the same as image_cipher_des (raw bytes, or Base64 if base64_output)."""
+    key_bytes = _check_stream_args(key, chunk_size)
+    cipher = get_backend(backend)
+    chain = iv  # last ciphertext block, carried between chunks
+    total = 0
+
+    with open(input_path, "rb") as src, open(output_path, "wb") as raw_out:
+        out = _Base64Writer(raw_out) if base64_output else raw_out
+        chunk = src.read(chunk_size)
+        while True:
+            next_chunk = src.read(chunk_size)
+            total += len(chunk)
+            if not next_chunk:
+                # PKCS5 padding only goes on the final chunk
+                out.write(cipher.encrypt_cbc(key_bytes, chain, pkcs5_pad(chunk)))
+                break
+            encrypted = cipher.encrypt_cbc(key_bytes, chain, chunk)
+            out.write(encrypted)
+            chain = encrypted[-BLOCK_SIZE:]
+            chunk = next_chunk
+        if base64_output:
+            out.close()
+    return total
+
+
+def decrypt_file_des(
+    input_path: str,
+    output_path: str,
+    key: str,
+    base64_input: bool = False,
+    chunk_size: int = CHUNK_SIZE,
+    backend: str = None,
+    iv: bytes = b"\x00" * 8,
+) -> int:
+    """Decrypt a file produced by encrypt_file_des (or a cipher_base64.txt
+    with base64_input=True) one chunk at a time. Returns the plaintext size."""
+    key_bytes = _check_stream_args(key, chunk_size)
+    cipher = get_backend(backend)
+    chain = iv
+    pending = b""  # ciphertext not yet aligned to 8 bytes
+    last_block = b""  # held back until the end to remove the padding
+    total = 0
+
+    with open(input_path, "rb") as src, open(output_path, "wb") as out:
+        if base64_input:
+            chunks = _read_base64_chunks(src, chunk_size)
+        else:
+            chunks = _read_chunks(src, chunk_size)
+        for chunk in chunks:
+            data = pending + chunk
+            cut = len(data) - len(data) % BLOCK_SIZE
+            data, pending = data[:cut], data[cut:]
+            if not data:
+                continue
+            plain = cipher.decrypt_cbc(key_bytes, chain, data)
+            chain = data[-BLOCK_SIZE:]
+            out.write(last_block + plain[:-BLOCK_SIZE])
+            total += len(last_block) + len(plain) - BLOCK_SIZE
+            last_block = plain[-BLOCK_SIZE:]
+        if pending:
+            raise ValueError("Ciphertext length must be a multiple of 8 bytes")
+        final = pkcs5_unpad(last_block)
+        out.write(final)
+        total += len(final)
+    return total
+
+
 def main():
     print("=== DES Image Cipher ===")
     option = input(
-        "Choose an option:\n1. Cipher an image\n2. Decipher an image\nEnter 1 or 2: "
+        "Choose an option:\n1. Cipher an image\n2. Decipher an image\n"
+        "3. Cipher a large file (streaming)\n4. Decipher a large file (streaming)\n"
+        "Enter 1, 2, 3 or 4: "
     )
 
     if option == "1":
         # Encrypt image
-        data_base64 = image_cipher_des(
-            input("Enter the path to the image file to encrypt: ")
-        )
+        path = input("Enter the path to the image file to encrypt: ")
+        as_text = input("Save as Base64 text instead of a binary container? (y/n): ")
+        output_format = "base64" if as_text.strip().lower() == "y" else "container"
+        image_cipher_des(path, output_format=output_format)
 
     elif option == "2":
         # Decrypt image
         key = input("Enter the 8-character key used for encryption: ")
+        path = input("Enter the path to the container or Base64 file: ")
 
-        # Read Base64 text from file
-        with open(input("Enter the path to the Base64 file: "), "r") as f:
-            data_base64 = f.read()
+        if is_container(path):
+            image_decipher_container(path, key)
+        else:
+            # Read Base64 text from file
+            with open(path, "r") as f:
+                data_base64 = f.read()
+            image_decipher_des(data_base64=data_base64, key=key)
 
-        image_decipher_des(data_base64=data_base64, key=key)
+    elif option in ("3", "4"):
+        # Streaming mode: the file is never fully loaded in memory
+        input_path = input("Enter the path to the input file: ")
+        output_path = input("Enter the path to the output file: ")
+        key = input("Enter an 8-character key: ")
+        use_base64 = input("Use Base64 text? (y/n): ").strip().lower() == "y"
+        if option == "3":
+            encrypt_file_des(input_path, output_path, key, base64_output=use_base64)
+            print(f"🔒 Encrypted file saved as: {output_path}")
+        else:
+            decrypt_file_des(input_path, output_path, key, base64_input=use_base64)
+            print(f"✅ Decrypted file saved as: {output_path}")
 
     else:
-        print("Invalid option. Please enter 1 or 2.")
+        print("Invalid option. Please enter 1, 2, 3 or 4.")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,234 @@
+"""
+Author: jpastor
+Date: 2026-10-17
+Binary container for DES ciphertext, replacing the Base64 text output.
+Layout (big-endian):
+    magic "DESC" | version u8 | algorithm u8 | mode u8 | reserved u8
+    iv 8 bytes | original length u64 | chunk size u32 | chunk count u32
+    chunk index: one u64 offset per chunk (relative to the ciphertext start)
+    raw ciphertext
+Chunks are encrypted as one continuous stream (padding only on the last
+one), and each chunk can still be decrypted on its own: CBC takes the last
+ciphertext block of the previous chunk as IV and CTR starts its counter at
+the chunk offset. Reading uses mmap, so only the requested chunk is touched.
+"""
+
+import base64
+import mmap
+import os
+import struct
+
+from des_backends import (
+    BLOCK_SIZE,
+    ctr_keystream,
+    get_backend,
+    pkcs5_pad,
+    pkcs5_unpad,
+    xor_bytes,
+)
+
+MAGIC = b"DESC"
+VERSION = 1
+HEADER = struct.Struct(">4sBBBB8sQII")
+OFFSET = struct.Struct(">Q")
+CHUNK_SIZE = 1 << 20
+ZERO_IV = b"\x00" * BLOCK_SIZE  # the IV of the cipher_base64.txt format
+
+ALGORITHMS = {1: "des", 2: "3des"}
+MODES = {1: "cbc", 2: "ctr", 3: "ecb"}
+MODE_IDS = {name: number for number, name in MODES.items()}
+
+
+# ---------- PRIVATE METHODS ----------
+def _key_bytes(key) -> bytes:
+    key = key.encode("utf-8") if isinstance(key, str) else bytes(key)
+    if len(key) not in (8, 16, 24):
+        raise ValueError("The key must be 8 bytes (DES) or 16/24 bytes (3DES).")
+    return key
+
+
+def _chunk_count(length: int, mode: str, chunk_size: int) -> int:
+    if mode == "ctr":
+        return -(-length // chunk_size)
+    # Padding always adds 1 to 8 bytes after the last full chunk
+    return length // chunk_size + 1
+
+
+def _encrypt_chunk(backend, key, mode, chunk, chain, offset, last):
+    """Encrypt one plaintext chunk; returns (ciphertext, new CBC chain)."""
+    if mode == "ctr":
+        counter = int.from_bytes(chain, "big") + offset // BLOCK_SIZE
+        keystream = ctr_keystream(backend, key, counter, len(chunk))
+        return xor_bytes(chunk, keystream), chain
+    if last:
+        chunk = pkcs5_pad(chunk)
+    if mode == "ecb":
+        return backend.encrypt_ecb(key, chunk), chain
+    encrypted = backend.encrypt_cbc(key, chain, chunk)
+    return encrypted, encrypted[-BLOCK_SIZE:]
+
+
+# ---------- PUBLIC METHODS ----------
+def write_container(
+    input_path: str,
+    output_path: str,
+    key,
+    mode: str = "cbc",
+    iv: bytes = None,
+    chunk_size: int = CHUNK_SIZE,
+    backend: str = None,
+) -> int:
+    """Encrypt a file into a container, reading one chunk at a time.
+    A random IV is used unless one is given; pass iv=ZERO_IV with DES in CBC
+    mode to be able to use export_base64. Returns the container size."""
+    key = _key_bytes(key)
+    if mode not in MODE_IDS:
+        raise ValueError(f"Unknown mode '{mode}'. Options: {list(MODE_IDS)}")
+    if chunk_size <= 0 or chunk_size % BLOCK_SIZE:
+        raise ValueError("chunk_size must be a positive multiple of 8")
+    iv = os.urandom(BLOCK_SIZE) if iv is None else iv
+    if len(iv) != BLOCK_SIZE:
+        raise ValueError("The IV must be exactly 8 bytes.")
+    cipher = get_backend(backend)
+
+    length = os.path.getsize(input_path)
+    count = _chunk_count(length, mode, chunk_size)
+    algorithm = 1 if len(key) == 8 else 2
+
+    with open(input_path, "rb") as src, open(output_path, "wb") as out:
+        header = (MAGIC, VERSION, algorithm, MODE_IDS[mode], 0, iv, length)
+        out.write(HEADER.pack(*header, chunk_size, count))
+        # Every chunk but the last has exactly chunk_size bytes of ciphertext
+        for i in range(count):
+            out.write(OFFSET.pack(i * chunk_size))
+
+        chain = iv
+        for i in range(count):
+            chunk = src.read(chunk_size)
+            encrypted, chain = _encrypt_chunk(
+                cipher, key, mode, chunk, chain, i * chunk_size, i == count - 1
+            )
+            out.write(encrypted)
+        return out.tell()
+
+
+def is_container(path: str) -> bool:
+    """True if the file starts with the container magic."""
+    with open(path, "rb") as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+class DesContainer:
+    """Read-only view of a container file, mapped with mmap."""
+
+    def __init__(self, path: str, backend: str = None):
+        self.path = path
+        self.backend = get_backend(backend)
+        self._file = open(path, "rb")
+        try:
+            if os.fstat(self._file.fileno()).st_size < HEADER.size:
+                raise ValueError("File is too short to be a DES container")
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except BaseException:
+            self._file.close()
+            raise
+        try:
+            self._read_header()
+        except BaseException:
+            self.close()
+            raise
+
+    # ---------- PRIVATE METHODS ----------
+    def _read_header(self):
+        fields = HEADER.unpack_from(self._map, 0)
+        magic, version, algorithm, mode, _, iv, length, chunk_size, count = fields
+        if magic != MAGIC:
+            raise ValueError("Not a DES container (bad magic)")
+        if version != VERSION:
+            raise ValueError(f"Unsupported container version {version}")
+        if algorithm not in ALGORITHMS:
+            raise ValueError(f"Unknown algorithm id {algorithm} in the container header")
+        if mode not in MODES:
+            raise ValueError(f"Unknown mode id {mode} in the container header")
+
+        self.algorithm = ALGORITHMS[algorithm]
+        self.mode = MODES[mode]
+        self.iv = iv
+        self.original_length = length
+        self.chunk_size = chunk_size
+        self.chunk_count = count
+        index_start = HEADER.size
+        self.data_start = index_start + count * OFFSET.size
+        if self.data_start > len(self._map):
+            raise ValueError("Truncated DES container (chunk index past the end)")
+        self.offsets = [
+            OFFSET.unpack_from(self._map, index_start + i * OFFSET.size)[0]
+            for i in range(count)
+        ]
+        self.ciphertext_length = len(self._map) - self.data_start
+
+    # ---------- PUBLIC METHODS ----------
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+    def ciphertext(self, i: int = None) -> memoryview:
+        """Raw ciphertext of chunk i (or all of it), without copying."""
+        view = memoryview(self._map)[self.data_start :]
+        if i is None:
+            return view
+        end = self.offsets[i + 1] if i + 1 < self.chunk_count else len(view)
+        return view[self.offsets[i] : end]
+
+    def read_chunk(self, i: int, key) -> bytes:
+        """Decrypt only chunk i."""
+        if not 0 <= i < self.chunk_count:
+            raise IndexError(f"Chunk {i} out of range (0-{self.chunk_count - 1})")
+        key = _key_bytes(key)
+        data = bytes(self.ciphertext(i))
+        offset = self.offsets[i]
+        last = i == self.chunk_count - 1
+
+        if self.mode == "ctr":
+            counter = int.from_bytes(self.iv, "big") + offset // BLOCK_SIZE
+            keystream = ctr_keystream(self.backend, key, counter, len(data))
+            return xor_bytes(data, keystream)
+        if self.mode == "ecb":
+            plain = self.backend.decrypt_ecb(key, data)
+        else:
+            # CBC only needs the last ciphertext block of the previous chunk
+            previous = self.iv
+            if i > 0:
+                previous = bytes(self.ciphertext()[offset - BLOCK_SIZE : offset])
+            plain = self.backend.decrypt_cbc(key, previous, data)
+        return pkcs5_unpad(plain) if last else plain
+
+    def decrypt_to(self, output_path: str, key) -> int:
+        """Decrypt every chunk in order into output_path."""
+        with open(output_path, "wb") as out:
+            for i in range(self.chunk_count):
+                out.write(self.read_chunk(i, key))
+            return out.tell()
+
+    def export_base64(self, output_path: str, chunk_size: int = 3 << 18) -> None:
+        """Write the ciphertext as Base64 text in the cipher_base64.txt format
+        (DES-CBC with a zero IV, read by des_cipher.image_decipher_des).
+        Raises ValueError for any other container, whose text could not be
+        decrypted that way."""
+        if self.algorithm != "des" or self.mode != "cbc" or self.iv != ZERO_IV:
+            raise ValueError(
+                "Only DES-CBC containers with a zero IV can be exported to the "
+                f"Base64 format, not {self.algorithm.upper()}-{self.mode.upper()} "
+                f"with IV {self.iv.hex()}"
+            )
+        data = self.ciphertext()
+        with open(output_path, "wb") as out:
+            # chunk_size is a multiple of 3 so the pieces concatenate cleanly
+            for start in range(0, len(data), chunk_size):
+                out.write(base64.b64encode(data[start : start + chunk_size]))
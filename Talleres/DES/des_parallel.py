@@ -0,0 +1,222 @@
+"""
+Author: jpastor
+Date: 2026-10-17
+Parallel DES for large files.
+CBC encryption is serial by nature, so this module adds the modes that can
+be split into independent segments:
+- CTR (counter) mode, for encryption and decryption.
+- ECB mode with PKCS5 padding, for encryption and decryption.
+- CBC decryption, where each block only needs the previous ciphertext block.
+The file is split into block-aligned segments that run on a process pool.
+Workers receive only (path, offset, length): they map the input and the
+preallocated output file with mmap, so no data is pickled between processes.
+"""
+
+import mmap
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from des_backends import (
+    BLOCK_SIZE,
+    ctr_keystream,
+    get_backend,
+    pkcs5_pad,
+    xor_bytes,
+)
+
+MIN_SEGMENT = 1 << 16  # smaller segments cost more in process overhead
+MODES = ("ctr", "ecb", "cbc")
+
+
+# ---------- PRIVATE METHODS ----------
+def _check_args(key: str, iv: bytes) -> bytes:
+    if len(key) != 8:
+        raise ValueError("The key must be exactly 8 characters (8 bytes).")
+    if len(iv) != BLOCK_SIZE:
+        raise ValueError("The IV must be exactly 8 bytes.")
+    return key.encode("utf-8")
+
+
+def _segments(length: int, workers: int) -> list[tuple[int, int]]:
+    """Split [0, length) into block-aligned (start, end) segments."""
+    if length == 0:
+        return []
+    count = max(1, min(workers * 4, length // MIN_SEGMENT))
+    size = -(-length // count)
+    size += -size % BLOCK_SIZE  # round up to whole blocks
+    return [(start, min(start + size, length)) for start in range(0, length, size)]
+
+
+def _process_segment(args) -> int:
+    """Run one segment in a worker process; returns the number of bytes written."""
+    mode, encrypt, key, iv, input_path, output_path, start, end, backend_name = args
+    backend = get_backend(backend_name)
+    with open(input_path, "rb") as src, open(output_path, "r+b") as dst:
+        data = mmap.mmap(src.fileno(), 0, access=mmap.ACCESS_READ)
+        out = mmap.mmap(dst.fileno(), 0)
+        with data, out:
+            segment = data[start:end]
+            if mode == "ctr":
+                counter = int.from_bytes(iv, "big") + start // BLOCK_SIZE
+                keystream = ctr_keystream(backend, key, counter, len(segment))
+                result = xor_bytes(segment, keystream)
+            elif mode == "ecb":
+                if encrypt:
+                    result = backend.encrypt_ecb(key, segment)
+                else:
+                    result = backend.decrypt_ecb(key, segment)
+            else:  # cbc decryption
+                previous = iv if start == 0 else data[start - BLOCK_SIZE : start]
+                result = backend.decrypt_cbc(key, previous, segment)
+            out[start : start + len(result)] = result
+    return len(result)
+
+
+def _run(mode, encrypt, key, iv, input_path, output_path, length, workers, backend):
+    """Process [0, length) of the input into the preallocated output."""
+    jobs = [
+        (mode, encrypt, key, iv, input_path, output_path, start, end, backend)
+        for start, end in _segments(length, workers)
+    ]
+    if workers == 1 or len(jobs) <= 1:
+        for job in jobs:
+            _process_segment(job)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            # Each segment writes its own slice, so the order is kept by offset
+            list(pool.map(_process_segment, jobs))
+
+
+def _preallocate(path: str, size: int) -> None:
+    with open(path, "wb") as f:
+        f.truncate(size)
+
+
+# ---------- PUBLIC METHODS ----------
+def parallel_encrypt_file(
+    input_path: str,
+    output_path: str,
+    key: str,
+    mode: str = "ctr",
+    iv: bytes = b"\x00" * 8,
+    workers: int = None,
+    backend: str = None,
+) -> int:
+    """Encrypt a file in CTR or ECB mode across a process pool.
+    Returns the size of the ciphertext."""
+    key_bytes = _check_args(key, iv)
+    workers = workers or os.cpu_count() or 1
+    if mode == "cbc":
+        raise ValueError("CBC encryption cannot be parallelized; use encrypt_file_des")
+    if mode not in MODES:
+        raise ValueError(f"Unknown mode '{mode}'. Options: {MODES}")
+
+    length = os.path.getsize(input_path)
+    if mode == "ctr":
+        # Stream mode: no padding, the ciphertext has the same size
+        _preallocate(output_path, length)
+        _run(
+            mode, True, key_bytes, iv, input_path, output_path, length, workers, backend
+        )
+        return length
+
+    # ECB: whole blocks in parallel, the padded tail in this process
+    full = length - length % BLOCK_SIZE
+    with open(input_path, "rb") as f:
+        f.seek(full)
+        tail = get_backend(backend).encrypt_ecb(key_bytes, pkcs5_pad(f.read()))
+    _preallocate(output_path, full + len(tail))
+    _run(mode, True, key_bytes, iv, input_path, output_path, full, workers, backend)
+    with open(output_path, "r+b") as f:
+        f.seek(full)
+        f.write(tail)
+    return full + len(tail)
+
+
+def parallel_decrypt_file(
+    input_path: str,
+    output_path: str,
+    key: str,
+    mode: str = "ctr",
+    iv: bytes = b"\x00" * 8,
+    workers: int = None,
+    backend: str = None,
+) -> int:
+    """Decrypt a file in CTR, ECB or CBC mode across a process pool.
+    CBC input can come from encrypt_file_des (raw output).
+    Returns the size of the plaintext."""
+    key_bytes = _check_args(key, iv)
+    workers = workers or os.cpu_count() or 1
+    if mode not in MODES:
+        raise ValueError(f"Unknown mode '{mode}'. Options: {MODES}")
+
+    length = os.path.getsize(input_path)
+    if mode != "ctr" and length % BLOCK_SIZE:
+        raise ValueError("Ciphertext length must be a multiple of 8 bytes")
+    _preallocate(output_path, length)
+    _run(
+        mode, False, key_bytes, iv, input_path, output_path, length, workers, backend
+    )
+    if mode == "ctr" or length == 0:
+        return length
+
+    # Remove the PKCS5 padding once every block is in place
+    with open(output_path, "r+b") as f:
+        f.seek(length - 1)
+        size = length - f.read(1)[0]
+        f.truncate(max(size, 0))
+    return max(size, 0)
+
+
+def scaling_benchmark(
+    size: int = 8 << 20, workers_list=(1, 2, 4, 8), mode: str = "ctr", backend=None
+) -> dict[int, float]:
+    """Encrypt a random file of `size` bytes with each worker count.
+    Returns MB/s per worker count."""
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, "plain.bin")
+        target = os.path.join(tmp, "cipher.bin")
+        with open(source, "wb") as f:
+            f.write(os.urandom(size))
+        for workers in workers_list:
+            start = time.perf_counter()
+            parallel_encrypt_file(
+                source, target, "key12345", mode, workers=workers, backend=backend
+            )
+            results[workers] = size / 1e6 / (time.perf_counter() - start)
+    return results
+
+
+def main():
+    print("=== Parallel DES ===")
+    option = input(
+        "Choose an option:\n1. Encrypt a file\n2. Decrypt a file\n3. Benchmark\n"
+        "Enter 1, 2 or 3: "
+    )
+
+    if option in ("1", "2"):
+        input_path = input("Enter the path to the input file: ")
+        output_path = input("Enter the path to the output file: ")
+        key = input("Enter an 8-character key: ")
+        mode = input("Mode (ctr, ecb or cbc): ").strip().lower()
+        if option == "1":
+            parallel_encrypt_file(input_path, output_path, key, mode)
+            print(f"🔒 Encrypted file saved as: {output_path}")
+        else:
+            parallel_decrypt_file(input_path, output_path, key, mode)
+            print(f"✅ Decrypted file saved as: {output_path}")
+
+    elif option == "3":
+        print(f"CPU cores: {os.cpu_count()}")
+        for workers, speed in scaling_benchmark().items():
+            print(f"{workers:>2} workers: {speed:8.2f} MB/s")
+
+    else:
+        print("Invalid option. Please enter 1, 2 or 3.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,452 @@
+"""
+Author: jpastor
+Date: 2026-10-17
+Benchmark suite for every cipher in Talleres.
+Times encrypt and decrypt from 1 KB up to 100 MB and reports throughput,
+latency percentiles and peak memory (tracemalloc, measured in a separate run
+so it does not slow down the timed runs). Every case is also a round-trip
+check: decrypt(encrypt(text)) must give the text back. On top of that, a
+known-answer check encrypts a fixed text with fixed keys and seeds and
+compares the SHA-256 of every ciphertext with the digest of the original
+(baseline) implementation, so an optimization cannot silently change the
+output.
+
+    python benchmark.py                                  # every cipher and size
+    python benchmark.py --max-size 1M -o before.json     # quick run, saved
+    python benchmark.py --max-size 1M --compare before.json
+
+The plaintext is built so that every cipher can round-trip it exactly:
+uppercase letters without J or X (Playfair), no letter repeated twice in a
+row (Playfair pairs) and a length that is a multiple of 48 (Hill 3x3 blocks,
+Playfair pairs and 4x4 grille blocks).
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import platform
+import statistics
+import string
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+SIZES = [1 << 10, 10 << 10, 100 << 10, 1 << 20, 10 << 20, 100 << 20]
+ALPHABET = "ABCDEFGHIKLMNOPQRSTUVWYZ"  # no J (Playfair) and no X (padding)
+BLOCK = 48
+
+HILL_KEY = [[6, 24, 1], [13, 16, 10], [20, 17, 15]]
+GRILLE = {"size": 4, "holes": [(0, 0), (2, 1), (2, 3), (3, 2)], "direction": 1}
+DES_KEY = b"key12345"
+
+sys.path.insert(0, os.path.join(HERE, "DES"))  # des_backends
+
+
+# ---------- CASES ----------
+# Each case takes the plaintext and returns (encrypt, decrypt, plaintext):
+# two callables and the value the round trip has to give back
+def _caesar(text):
+    from caesar import caesar_decrypt, caesar_encrypt
+
+    return lambda: caesar_encrypt(text, 3), lambda c: caesar_decrypt(c, 3), text
+
+
+def _vigenere(text):
+    from vigenere import vigenere_decrypt, vigenere_encrypt
+
+    return (
+        lambda: vigenere_encrypt(text, "LEMON", 1),
+        lambda c: vigenere_decrypt(c, "LEMON", 1),
+        text,
+    )
+
+
+def _otp(text):
+    from otp import generateRandomKey, otpDecrypt, otpEncrypt
+
+    key = generateRandomKey(len(text))
+    return lambda: otpEncrypt(text, key), lambda c: otpDecrypt(c, key), text
+
+
+def _playfair(text):
+    from playfair import playfair
+
+    return (
+        lambda: playfair(text, "MONARCHY", 1),
+        lambda c: playfair(c, "MONARCHY", 0),
+        text,
+    )
+
+
+def _hill_function(text):
+    from hill import hill_cipher_decrypt, hill_cipher_encrypt
+
+    return (
+        lambda: hill_cipher_encrypt(text, HILL_KEY),
+        lambda c: hill_cipher_decrypt(c, HILL_KEY),
+        text,
+    )
+
+
+def _hill_class(text):
+    from hill_cipher import HillCipher
+
+    cipher = HillCipher(HILL_KEY)
+    return lambda: cipher.encrypt(text), cipher.decrypt, text
+
+
+def _homophonic(text):
+    from homophonic import HomophonicCipher, gen_layout
+
+    cipher = HomophonicCipher(gen_layout())
+    return lambda: cipher.encrypt(text), cipher.decrypt, text
+
+
+def _turning_grille(text):
+    from turning_grille import turning_grille
+
+    size, holes, direction = GRILLE["size"], GRILLE["holes"], GRILLE["direction"]
+    return (
+        lambda: turning_grille(text, size, direction, 1, holes),
+        lambda c: turning_grille(c, size, direction, 0, holes),
+        text,
+    )
+
+
+def _des(text):
+    from des_backends import get_backend, pkcs5_pad, pkcs5_unpad
+
+    backend, iv, data = get_backend(), b"\x00" * 8, text.encode("ascii")
+    return (
+        lambda: backend.encrypt_cbc(DES_KEY, iv, pkcs5_pad(data)),
+        lambda c: pkcs5_unpad(backend.decrypt_cbc(DES_KEY, iv, c)),
+        data,
+    )
+
+
+CASES = {
+    "caesar": _caesar,
+    "vigenere": _vigenere,
+    "otp": _otp,
+    "playfair": _playfair,
+    "hill": _hill_function,
+    "hill_class": _hill_class,
+    "homophonic": _homophonic,
+    "turning_grille": _turning_grille,
+    "des": _des,
+}
+
+
+# ---------- KNOWN ANSWERS ----------
+# Mixed case, spaces and punctuation, so text handling is checked too
+KNOWN_TEXT = "Meet me by the Old Oak tree at dawn; bring the Hill key and twelve coins"
+KNOWN_SEED = 2026
+OTP_ALPHABET = string.ascii_letters + string.digits + string.punctuation + " "
+
+
+def _known_otp(text):
+    import random
+
+    from otp import otpEncrypt
+
+    key = "".join(random.Random(KNOWN_SEED).choices(OTP_ALPHABET, k=len(text)))
+    return otpEncrypt(text, key)
+
+
+def _known_homophonic(text):
+    import random
+
+    from homophonic import encrypt, gen_layout
+
+    layout = gen_layout()
+    random.seed(KNOWN_SEED)  # encrypt draws from the global random
+    return encrypt(text, layout)
+
+
+def _known_homophonic_class(text):
+    from homophonic import HomophonicCipher, gen_layout
+
+    return HomophonicCipher(gen_layout(), seed=KNOWN_SEED).encrypt(text)
+
+
+def _known_grille(holes):
+    def encrypt(text):
+        from turning_grille import turning_grille
+
+        return turning_grille(text, GRILLE["size"], GRILLE["direction"], 1, holes)
+
+    return encrypt
+
+
+def _known_des(text):
+    from des_backends import get_backend, pkcs5_pad
+
+    return get_backend().encrypt_cbc(DES_KEY, b"\x00" * 8, pkcs5_pad(text.encode("utf-8")))
+
+
+def _encrypt_with(case):
+    """Known-answer encrypt function from a benchmark case."""
+    return lambda text: case(text)[0]()
+
+
+KNOWN_CASES = {
+    "caesar": _encrypt_with(_caesar),
+    "vigenere": _encrypt_with(_vigenere),
+    "otp": _known_otp,
+    "playfair": _encrypt_with(_playfair),
+    "hill": _encrypt_with(_hill_function),
+    "hill_class": _encrypt_with(_hill_class),
+    "homophonic": _known_homophonic,
+    "homophonic_class": _known_homophonic_class,
+    "turning_grille": _known_grille(GRILLE["holes"]),
+    "turning_grille_incomplete": _known_grille([(0, 0), (0, 1)]),
+    "des": _known_des,
+}
+
+# SHA-256 of KNOWN_CASES[name](KNOWN_TEXT) with the baseline implementation
+# (HomophonicCipher did not exist there; its digest is the one it shipped with)
+KNOWN_ANSWERS = {
+    "caesar": (
+        "e6c1c11e9209899266fa5865188351e90d89757f505beecb89eeafb2343f27e4"
+    ),
+    "vigenere": (
+        "5a247ac98dad49cedc8c9a306a02da65378db608a4b8f3d1b93164fbd871e4e9"
+    ),
+    "otp": (
+        "21a5da4e97ae7ee4e7f4af73b0b30e1c37d164268a3a342c7d44f067d9146fd5"
+    ),
+    "playfair": (
+        "7c48e01fcf402a02096346844c13db7f4e40b34c5e2755eb842114e27de1775b"
+    ),
+    "hill": (
+        "27c7c8966938f83ff991ce38c091562c67489b9e046399acf03dc01cf3e8fb1f"
+    ),
+    "hill_class": (
+        "27c7c8966938f83ff991ce38c091562c67489b9e046399acf03dc01cf3e8fb1f"
+    ),
+    "homophonic": (
+        "edfabbfce4b868f57ddf798c76576717b2b1653c7c1f94b31b91f89372ae2502"
+    ),
+    "homophonic_class": (
+        "e5f35aef0c68b185ac001bfac2b473eb477500feeb1706b869eb286b57110a4b"
+    ),
+    "turning_grille": (
+        "8304ac97b620a84fcfd60a8a21f9c3ddfb2bcbae97b3e6ae9c2c76dac559361e"
+    ),
+    "turning_grille_incomplete": (
+        "0d363332420660b0e90a90a2af62da535b0fbb700f05f892f9ec3ebf93d576af"
+    ),
+    "des": (
+        "47182781428cb428f14ee7a168cac9e3a9dbcfa0337a36b87ae883b0ed4038e6"
+    ),
+}
+
+
+# ---------- PRIVATE METHODS ----------
+def _plaintext(size: int, seed: int = 0) -> str:
+    """Letters from ALPHABET, never the same letter twice in a row."""
+    import numpy as np
+
+    length = max(BLOCK, size - size % BLOCK)
+    steps = np.random.default_rng(seed).integers(1, len(ALPHABET), length)
+    index = np.cumsum(steps) % len(ALPHABET)
+    table = np.frombuffer(ALPHABET.encode("ascii"), dtype=np.uint8)
+    return table[index].tobytes().decode("ascii")
+
+
+def _parse_size(value: str) -> int:
+    units = {"K": 1 << 10, "M": 1 << 20, "G": 1 << 30}
+    value = value.strip().upper().rstrip("B")
+    if value and value[-1] in units:
+        return int(float(value[:-1]) * units[value[-1]])
+    return int(value)
+
+
+def _percentile(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    pos = (len(ordered) - 1) * q
+    low = int(pos)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (pos - low)
+
+
+def _time_calls(call, repeat: int, budget: float) -> list[float]:
+    """Latencies (s) of at least one and at most `repeat` calls, stopping
+    early once `budget` seconds have been spent."""
+    latencies = []
+    spent = 0.0
+    while len(latencies) < repeat and (not latencies or spent < budget):
+        start = time.perf_counter()
+        call()
+        latencies.append(time.perf_counter() - start)
+        spent += latencies[-1]
+    return latencies
+
+
+def _peak_memory(call) -> int:
+    """Peak bytes allocated by one call (Python and NumPy allocations)."""
+    tracemalloc.start()
+    try:
+        call()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def _summary(latencies: list[float], size: int) -> dict:
+    median = statistics.median(latencies)
+    return {
+        "runs": len(latencies),
+        "mean_ms": statistics.fmean(latencies) * 1000,
+        "p50_ms": median * 1000,
+        "p90_ms": _percentile(latencies, 0.90) * 1000,
+        "p99_ms": _percentile(latencies, 0.99) * 1000,
+        "mb_s": size / 1e6 / median if median else float("inf"),
+    }
+
+
+# ---------- PUBLIC METHODS ----------
+def check_known_answers(names=None) -> list[str]:
+    """Encrypt KNOWN_TEXT with every known-answer case and return the ones
+    whose ciphertext digest differs from KNOWN_ANSWERS."""
+    failures = []
+    for name in names or KNOWN_CASES:
+        ciphertext = KNOWN_CASES[name](KNOWN_TEXT)
+        if isinstance(ciphertext, str):
+            ciphertext = ciphertext.encode("utf-8")
+        digest = hashlib.sha256(ciphertext).hexdigest()
+        if digest != KNOWN_ANSWERS[name]:
+            failures.append(f"{name}: known-answer ciphertext changed (sha256 {digest[:16]}...)")
+    return failures
+
+
+def run_case(name: str, size: int, repeat: int = 5, budget: float = 2.0,
+             memory: bool = True) -> list[dict]:
+    """Benchmark one cipher at one size; returns one result per operation.
+    Raises AssertionError if the round trip does not give the text back."""
+    text = _plaintext(size)
+    encrypt, decrypt, expected = CASES[name](text)
+
+    ciphertext = encrypt()
+    if decrypt(ciphertext) != expected:
+        raise AssertionError(f"{name}: round trip failed at {len(text)} bytes")
+
+    results = []
+    for op, call in (("encrypt", encrypt), ("decrypt", lambda: decrypt(ciphertext))):
+        result = {"cipher": name, "size": len(text), "op": op}
+        result.update(_summary(_time_calls(call, repeat, budget), len(text)))
+        if memory:
+            result["peak_mb"] = _peak_memory(call) / 1e6
+        results.append(result)
+    return results
+
+
+def run(ciphers=None, sizes=SIZES, repeat: int = 5, budget: float = 2.0,
+        memory: bool = True, log=None) -> dict:
+    """Check the known answers, then benchmark every cipher at every size.
+    Changed ciphertexts and failed round trips are recorded under "failures"
+    instead of stopping the run."""
+    report = {
+        "meta": {
+            "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+        },
+        "results": [],
+        "failures": [],
+    }
+    selected = ciphers or list(CASES)
+    # Known-answer cases named after a selected cipher (e.g. homophonic_class)
+    known = [k for k in KNOWN_CASES if any(k == c or k.startswith(c + "_") for c in selected)]
+    for failure in check_known_answers(known):
+        report["failures"].append(failure)
+        if log:
+            log(f"FAIL {failure}")
+    for name in selected:
+        for size in sizes:
+            try:
+                results = run_case(name, size, repeat, budget, memory)
+            except AssertionError as e:
+                report["failures"].append(str(e))
+                if log:
+                    log(f"FAIL {e}")
+                continue
+            report["results"].extend(results)
+            if log:
+                for r in results:
+                    log(_format_row(r))
+    return report
+
+
+def compare(report: dict, baseline: dict, tolerance: float = 0.10) -> list[str]:
+    """Cases whose throughput dropped more than `tolerance` against baseline."""
+    old = {(r["cipher"], r["size"], r["op"]): r for r in baseline["results"]}
+    regressions = []
+    for r in report["results"]:
+        before = old.get((r["cipher"], r["size"], r["op"]))
+        if before and r["mb_s"] < before["mb_s"] * (1 - tolerance):
+            regressions.append(
+                f"{r['cipher']} {r['op']} {r['size']} B: "
+                f"{before['mb_s']:.3f} -> {r['mb_s']:.3f} MB/s"
+            )
+    return regressions
+
+
+def _format_row(r: dict) -> str:
+    peak = f"{r['peak_mb']:9.2f}" if "peak_mb" in r else f"{'-':>9}"
+    return (
+        f"{r['cipher']:<15} {r['op']:<8} {r['size']:>10} {r['runs']:>4} "
+        f"{r['p50_ms']:11.3f} {r['p90_ms']:11.3f} {r['p99_ms']:11.3f} "
+        f"{r['mb_s']:10.3f} {peak}"
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark every cipher")
+    parser.add_argument("--ciphers", nargs="+", choices=list(CASES), default=list(CASES))
+    parser.add_argument("--sizes", nargs="+", type=_parse_size, default=SIZES,
+                        help="message sizes, e.g. 1K 64K 10M")
+    parser.add_argument("--max-size", type=_parse_size, help="skip larger sizes")
+    parser.add_argument("--repeat", type=int, default=5, help="timed calls per case")
+    parser.add_argument("--budget", type=float, default=2.0,
+                        help="stop repeating a case after this many seconds")
+    parser.add_argument("--no-memory", action="store_true", help="skip tracemalloc")
+    parser.add_argument("-o", "--output", help="write the JSON report here")
+    parser.add_argument("--compare", help="baseline JSON report to compare with")
+    parser.add_argument("--tolerance", type=float, default=0.10,
+                        help="allowed throughput drop before flagging a regression")
+    args = parser.parse_args(argv)
+
+    sizes = [s for s in args.sizes if args.max_size is None or s <= args.max_size]
+    print(
+        f"{'cipher':<15} {'op':<8} {'bytes':>10} {'runs':>4} {'p50 ms':>11} "
+        f"{'p90 ms':>11} {'p99 ms':>11} {'MB/s':>10} {'peak MB':>9}"
+    )
+    report = run(args.ciphers, sizes, args.repeat, args.budget,
+                 not args.no_memory, log=print)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Report saved as: {args.output}")
+
+    status = 0
+    if report["failures"]:
+        print(f"{len(report['failures'])} known-answer or round trip check(s) failed")
+        status = 1
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            regressions = compare(report, json.load(f), args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        status = status or int(bool(regressions))
+    sys.exit(status)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,18 +5,90 @@ Caesar's Cipher Encryption and Decryption Example
 """
 
 
+import functools
+
+ALPHABET_SIZE = 26
+
+
+class _ShiftTable(dict):
+    """str.translate table that also shifts non-ASCII letters lazily."""
+
+    def __init__(self, shift):
+        super().__init__()
+        self.shift = shift
+
+    def __missing__(self, code):
+        char = chr(code)
+        if not char.isalpha():
+            # LookupError tells str.translate to leave the character unchanged
+            raise LookupError(code)
+        # Same arithmetic as the original per-character loop
+        base = ord("A") if char.isupper() else ord("a")
+        self[code] = chr((code - base + self.shift) % ALPHABET_SIZE + base)
+        return self[code]
+
+
+@functools.lru_cache(maxsize=ALPHABET_SIZE)
+def _tables(shift):
+    """Build the str and bytes translation tables for a shift (cached)."""
+    lower = "abcdefghijklmnopqrstuvwxyz"
+    upper = lower.upper()
+    shifted_lower = lower[shift:] + lower[:shift]
+    shifted_upper = upper[shift:] + upper[:shift]
+
+    str_table = _ShiftTable(shift)
+    str_table.update(str.maketrans(lower + upper, shifted_lower + shifted_upper))
+    bytes_table = bytes.maketrans(
+        (lower + upper).encode("ascii"), (shifted_lower + shifted_upper).encode("ascii")
+    )
+    return str_table, bytes_table
+
+
+class CaesarCipher:
+    def __init__(self, shift):
+        """Initialize the cipher with a shift; the tables are built only once."""
+        self.shift = shift % ALPHABET_SIZE
+        self._encrypt_tables = _tables(self.shift)
+        self._decrypt_tables = _tables(-self.shift % ALPHABET_SIZE)
+
+    @staticmethod
+    def _translate(data, tables):
+        str_table, bytes_table = tables
+        if isinstance(data, str):
+            return data.translate(str_table)
+        # bytes, bytearray and memoryview only shift ASCII letters
+        return bytes(data).translate(bytes_table)
+
+    def encrypt(self, data):
+        """Encrypt a str or bytes-like object."""
+        return self._translate(data, self._encrypt_tables)
+
+    def decrypt(self, data):
+        """Decrypt a str or bytes-like object."""
+        return self._translate(data, self._decrypt_tables)
+
+    def _stream(self, fileobj_in, fileobj_out, chunk_size, tables):
+        total = 0
+        while True:
+            chunk = fileobj_in.read(chunk_size)
+            if not chunk:
+                break
+            fileobj_out.write(self._translate(chunk, tables))
+            total += len(chunk)
+        return total
+
+    def encrypt_stream(self, fileobj_in, fileobj_out, chunk_size=1 << 20):
+        """Encrypt a text or binary file object chunk by chunk.
+        Returns the number of characters (or bytes) processed."""
+        return self._stream(fileobj_in, fileobj_out, chunk_size, self._encrypt_tables)
+
+    def decrypt_stream(self, fileobj_in, fileobj_out, chunk_size=1 << 20):
+        """Decrypt a text or binary file object chunk by chunk."""
+        return self._stream(fileobj_in, fileobj_out, chunk_size, self._decrypt_tables)
+
+
 def caesar_encrypt(text, shifts):
-    ciphertext = ""
-    for char in text:
-        if char.isalpha():
-            # Determine if character is uppercase or lowercase
-            base = ord("A") if char.isupper() else ord("a")
-            # Shift character and wrap around the alphabet
-            ciphertext += chr((ord(char) - base + shifts) % 26 + base)
-        else:
-            # Non-alphabetic characters are added unchanged
-            ciphertext += char
-    return ciphertext
+    return CaesarCipher(shifts).encrypt(text)
 
 
 def caesar_decrypt(ciphertext, shifts):
@@ -0,0 +1,173 @@
+"""
+Author: jpastor
+Date: 2026-10-17
+Client and load generator for cipher_server.py.
+CipherClient pipelines requests over one connection and matches responses
+by id. load_test opens several connections, keeps a fixed number of
+requests in flight and reports requests per second and latency percentiles.
+
+    python cipher_client.py --requests 20000 --concurrency 256 --connections 8
+    python cipher_client.py --algorithm hill --key '[[3,3],[2,5]]' --size 64
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import random
+import string
+import time
+
+from cipher_server import encode_frame, read_frame
+from ciphers import parse_key
+
+
+class CipherClient:
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self._reader = reader
+        self._writer = writer
+        self._ids = itertools.count()
+        self._waiting = {}
+        self._receiver = asyncio.create_task(self._receive())
+
+    @classmethod
+    async def connect(cls, host: str = "127.0.0.1", port: int = 8765) -> "CipherClient":
+        reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer)
+
+    # ---------- PRIVATE METHODS ----------
+    def _fail_waiting(self, error: Exception):
+        """Fail every request still waiting for a response."""
+        waiting, self._waiting = self._waiting, {}
+        for future in waiting.values():
+            if not future.done():
+                future.set_exception(error)
+
+    async def _receive(self):
+        try:
+            while (response := await read_frame(self._reader)) is not None:
+                future = self._waiting.pop(response.get("id"), None)
+                if future is not None and not future.done():
+                    future.set_result(response)
+        finally:
+            self._fail_waiting(ConnectionError("Connection closed"))
+
+    # ---------- PUBLIC METHODS ----------
+    async def request(self, algorithm: str, key, text: str, mode: str = "encrypt") -> dict:
+        """Send one request and wait for its response dict.
+        Raises ConnectionError if the connection is closed, before or while
+        waiting."""
+        # Nothing would ever answer once the receiver has stopped
+        if self._receiver.done():
+            raise ConnectionError("Connection closed")
+        request_id = next(self._ids)
+        frame = encode_frame({"id": request_id, "algorithm": algorithm, "key": key,
+                              "text": text, "mode": mode})
+        future = asyncio.get_running_loop().create_future()
+        self._waiting[request_id] = future
+        try:
+            self._writer.write(frame)
+            await self._writer.drain()
+        except Exception as e:
+            # The connection is unusable, so no pending request will be answered
+            self._waiting.pop(request_id, None)
+            self._fail_waiting(ConnectionError(f"Connection lost: {e}"))
+            raise
+        return await future
+
+    async def run(self, algorithm: str, key, text: str, mode: str = "encrypt") -> str:
+        """Like request() but returns the result and raises on errors."""
+        response = await self.request(algorithm, key, text, mode)
+        if "error" in response:
+            raise RuntimeError(response["error"])
+        return response["result"]
+
+    async def close(self):
+        self._writer.close()
+        await self._writer.wait_closed()
+        self._receiver.cancel()
+
+
+def _percentile(ordered: list[float], q: float) -> float:
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))] if ordered else 0.0
+
+
+async def load_test(
+    host: str = "127.0.0.1",
+    port: int = 8765,
+    requests: int = 10000,
+    concurrency: int = 128,
+    connections: int = 4,
+    algorithm: str = "caesar",
+    key=3,
+    size: int = 32,
+) -> dict:
+    """Send `requests` encrypt requests with `concurrency` in flight at once."""
+    clients = [await CipherClient.connect(host, port) for _ in range(connections)]
+    text = "".join(random.choices(string.ascii_uppercase, k=size))
+    latencies = []
+    errors = 0
+    remaining = itertools.count()
+
+    async def worker(client):
+        nonlocal errors
+        while next(remaining) < requests:
+            start = time.perf_counter()
+            response = await client.request(algorithm, key, text)
+            latencies.append(time.perf_counter() - start)
+            errors += "error" in response
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(clients[i % connections]) for i in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    for client in clients:
+        await client.close()
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "seconds": elapsed,
+        "rps": len(latencies) / elapsed,
+        "p50_ms": _percentile(latencies, 0.50) * 1000,
+        "p90_ms": _percentile(latencies, 0.90) * 1000,
+        "p99_ms": _percentile(latencies, 0.99) * 1000,
+        "p999_ms": _percentile(latencies, 0.999) * 1000,
+        "max_ms": latencies[-1] * 1000 if latencies else 0.0,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load generator for cipher_server.py")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--requests", type=int, default=10000)
+    parser.add_argument("--concurrency", type=int, default=128, help="requests in flight")
+    parser.add_argument("--connections", type=int, default=4)
+    parser.add_argument("--algorithm", default="caesar")
+    parser.add_argument("--key", default="3", help="JSON for structured keys, else text")
+    parser.add_argument("--size", type=int, default=32, help="letters per request")
+    parser.add_argument("--json", action="store_true", help="print JSON")
+    args = parser.parse_args(argv)
+
+    try:
+        key = parse_key(args.algorithm, args.key)
+    except json.JSONDecodeError as e:
+        parser.error(f"--key for {args.algorithm} must be JSON: {e}")
+    report = asyncio.run(
+        load_test(args.host, args.port, args.requests, args.concurrency,
+                  args.connections, args.algorithm, key, args.size)
+    )
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+    print(f"{report['requests']} requests in {report['seconds']:.2f} s "
+          f"({report['errors']} errors)")
+    print(f"{report['rps']:.0f} requests/s")
+    print(f"latency ms: p50 {report['p50_ms']:.2f} | p90 {report['p90_ms']:.2f} | "
+          f"p99 {report['p99_ms']:.2f} | p99.9 {report['p999_ms']:.2f} | "
+          f"max {report['max_ms']:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+"""
+Author: jpastor
+Date: 2026-10-17
+asyncio server for encryption requests over length-prefixed TCP.
+Every message is a 4-byte big-endian length followed by a UTF-8 JSON object:
+    request:  {"id": 1, "algorithm": "caesar", "key": 3, "text": "HELLO",
+               "mode": "encrypt"}
+    response: {"id": 1, "result": "KHOOR"}  or  {"id": 1, "error": "..."}
+Requests on one connection may be pipelined; responses carry the request id
+and can come back out of order.
+
+Algorithms and keys are the ones in ciphers.py, whose cipher objects are
+cached per key. Small requests run inline on the event loop; Hill with a
+large key and big payloads (e.g. DES over large files) go to a process pool.
+
+Backpressure:
+- at most `max_inflight` requests are processed at once; when the limit is
+  reached the server stops reading from sockets, so clients are slowed down
+  by TCP itself,
+- at most `max_pending` requests per connection,
+- at most `max_heavy` requests waiting for or running in the process pool,
+  beyond that new heavy requests are answered with an "overloaded" error,
+- frames larger than `max_frame` close the connection.
+
+    python cipher_server.py --port 8765 --workers 4
+"""
+
+import argparse
+import asyncio
+import importlib
+import json
+import os
+import struct
+from concurrent.futures import ProcessPoolExecutor
+
+from ciphers import REGISTRY, run_record
+from lazy import load_all
+
+FRAME = struct.Struct(">I")
+MAX_FRAME = 16 << 20
+HEAVY_SIZE = 64 << 10  # bytes of text that make any request heavy
+HEAVY_HILL_N = 8  # Hill keys at least this big are heavy
+PRELOAD = ["hill", "hill_cipher", "des_backends"]  # cipher modules that use numpy
+
+
+# ---------- FRAMING ----------
+async def read_frame(reader: asyncio.StreamReader, max_frame: int = MAX_FRAME):
+    """Read one JSON message; returns None at end of stream."""
+    try:
+        header = await reader.readexactly(FRAME.size)
+    except asyncio.IncompleteReadError:
+        return None
+    (length,) = FRAME.unpack(header)
+    if length > max_frame:
+        raise ValueError(f"Frame of {length} bytes exceeds the {max_frame} limit")
+    return json.loads(await reader.readexactly(length))
+
+
+def encode_frame(message: dict) -> bytes:
+    data = json.dumps(message, ensure_ascii=False).encode("utf-8")
+    return FRAME.pack(len(data)) + data
+
+
+# ---------- SERVER ----------
+class CipherServer:
+    def __init__(
+        self,
+        workers: int = None,
+        max_inflight: int = 1024,
+        max_pending: int = 64,
+        max_heavy: int = 256,
+        max_frame: int = MAX_FRAME,
+    ):
+        self.workers = workers or os.cpu_count() or 1
+        self.max_frame = max_frame
+        self.max_pending = max_pending
+        self.max_heavy = max_heavy
+        self._inflight = asyncio.Semaphore(max_inflight)
+        self._heavy = 0
+        self._pool = None
+        self.port = None
+        self.stats = {"requests": 0, "inline": 0, "pool": 0, "rejected": 0, "errors": 0}
+
+    # ---------- PRIVATE METHODS ----------
+    def _is_heavy(self, record: dict) -> bool:
+        text = record.get("text")
+        if isinstance(text, str) and len(text) >= HEAVY_SIZE:
+            return True
+        key = record.get("key")
+        if isinstance(key, dict):
+            key = key.get("key")
+        return (
+            record.get("algorithm") == "hill"
+            and isinstance(key, list)
+            and len(key) >= HEAVY_HILL_N
+        )
+
+    async def _process(self, record: dict) -> dict:
+        self.stats["requests"] += 1
+        if not isinstance(record, dict):
+            return {"id": None, "error": "ValueError: request must be a JSON object"}
+        if not self._is_heavy(record):
+            self.stats["inline"] += 1
+            return run_record(record)
+        if self._heavy >= self.max_heavy:
+            self.stats["rejected"] += 1
+            return {"id": record.get("id"), "error": "overloaded: try again later"}
+        self._heavy += 1
+        self.stats["pool"] += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._pool, run_record, record)
+        finally:
+            self._heavy -= 1
+
+    async def _respond(self, record, writer, lock, pending):
+        try:
+            response = await self._process(record)
+            if "error" in response:
+                self.stats["errors"] += 1
+            async with lock:
+                writer.write(encode_frame(response))
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self._inflight.release()
+            pending.release()
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Serve one connection until the client closes it."""
+        lock = asyncio.Lock()  # one frame at a time on the socket
+        pending = asyncio.Semaphore(self.max_pending)
+        tasks = set()
+        try:
+            while True:
+                # Take the slots before reading, so a busy server stops reading
+                await pending.acquire()
+                await self._inflight.acquire()
+                try:
+                    record = await read_frame(reader, self.max_frame)
+                except (ValueError, ConnectionError, asyncio.IncompleteReadError) as e:
+                    self._inflight.release()
+                    pending.release()
+                    if isinstance(e, ValueError):
+                        writer.write(encode_frame({"id": None, "error": f"ValueError: {e}"}))
+                    break
+                if record is None:
+                    self._inflight.release()
+                    pending.release()
+                    break
+                task = asyncio.create_task(self._respond(record, writer, lock, pending))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks)
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    # ---------- PUBLIC METHODS ----------
+    async def serve(self, host: str = "127.0.0.1", port: int = 8765, ready=None):
+        """Run until cancelled. `ready` (an asyncio.Event) is set once listening."""
+        # Load numpy up front: the first request is not slowed down, and no
+        # lazy module (not thread-safe on 3.11) is loaded while serving
+        for name in PRELOAD:
+            importlib.import_module(name)
+        load_all()
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            self._pool = pool
+            server = await asyncio.start_server(self.handle, host, port)
+            self.port = server.sockets[0].getsockname()[1]
+            if ready is not None:
+                ready.set()
+            async with server:
+                await server.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Cipher server (length-prefixed TCP)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, help="processes for heavy requests")
+    parser.add_argument("--max-inflight", type=int, default=1024)
+    parser.add_argument("--max-pending", type=int, default=64, help="per connection")
+    parser.add_argument("--max-heavy", type=int, default=256)
+    args = parser.parse_args(argv)
+
+    server = CipherServer(args.workers, args.max_inflight, args.max_pending, args.max_heavy)
+    print(f"=== Cipher server on {args.host}:{args.port} ===")
+    print(f"Algorithms: {', '.join(sorted(REGISTRY))}")
+    try:
+        asyncio.run(server.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        print(f"Stopped. {server.stats}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,265 @@
+"""
+Author: jpastor
+Date: 2026-10-17
+Common interface and registry for every cipher in Talleres, plus a
+non-interactive command line for files, stdin and JSON-lines batches.
+
+Examples:
+    python ciphers.py encrypt caesar --key 3 < message.txt
+    python ciphers.py decrypt vigenere --key '{"key": "LEMON", "t": 2}' -i in.txt
+    python ciphers.py batch -i records.jsonl -o results.jsonl --workers 4
+
+Batch records look like
+    {"id": 1, "algorithm": "hill", "key": [[3, 3], [2, 5]], "text": "HELP",
+     "mode": "encrypt"}
+and cipher objects are reused for every record with the same algorithm and key.
+"""
+
+import argparse
+import collections
+import functools
+import itertools
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Protocol
+
+
+class Cipher(Protocol):
+    def encrypt(self, text: str) -> str: ...
+
+    def decrypt(self, text: str) -> str: ...
+
+
+# The DES modules import each other by plain name, as when run from DES/;
+# importing them the same way here keeps a single copy of each module
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "DES"))
+
+REGISTRY: dict[str, Callable[..., Cipher]] = {}
+JSON_KEYS = {"caesar", "hill", "homophonic", "turning_grille"}  # keys written as JSON
+
+
+def register(name: str):
+    """Decorator that adds a factory `factory(key) -> Cipher` to the registry."""
+
+    def decorator(factory):
+        REGISTRY[name] = factory
+        return factory
+
+    return decorator
+
+
+# ---------- ADAPTERS ----------
+# Modules are imported inside each factory, so only the ciphers in use are loaded
+class _FunctionCipher:
+    """Wrap a pair of encrypt/decrypt callables that take only the text."""
+
+    def __init__(self, encrypt, decrypt):
+        self.encrypt = encrypt
+        self.decrypt = decrypt
+
+
+@register("caesar")
+def _caesar(key) -> Cipher:
+    from caesar import CaesarCipher
+
+    return CaesarCipher(int(key))
+
+
+@register("vigenere")
+def _vigenere(key) -> Cipher:
+    from vigenere import VigenereCipher
+
+    if isinstance(key, dict):
+        cipher = VigenereCipher(key["key"], key.get("t", 1))
+    else:
+        cipher = VigenereCipher(key)
+
+    # Same checks as vigenere_encrypt / vigenere_decrypt
+    def encrypt(text):
+        cipher.check_key_length(text)
+        return cipher.encrypt(text)
+
+    def decrypt(text):
+        cipher.check_key_length(text)
+        return cipher.decrypt(text)
+
+    return _FunctionCipher(encrypt, decrypt)
+
+
+@register("playfair")
+def _playfair(key) -> Cipher:
+    from playfair import get_cipher
+
+    return get_cipher(key)
+
+
+@register("hill")
+def _hill(key) -> Cipher:
+    from hill_cipher import HillCipher
+
+    # Either the key matrix or {"key": [[..]], "alphabet": "...", "modulus": m}
+    if isinstance(key, dict):
+        return HillCipher(key["key"], key.get("alphabet"), key.get("modulus"))
+    return HillCipher(key)
+
+
+@register("homophonic")
+def _homophonic(key) -> Cipher:
+    from homophonic import HomophonicCipher, gen_layout
+
+    # Either a full layout {"A": [..], ...} or the gen_layout parameters
+    key = key or {}
+    if all(k in ("m", "n", "seed") for k in key):
+        key = gen_layout(**key)
+    return HomophonicCipher(key)
+
+
+@register("turning_grille")
+def _turning_grille(key) -> Cipher:
+    from turning_grille import TurningGrille
+
+    holes = [tuple(hole) for hole in key["holes"]]
+    return TurningGrille(key["size"], holes, key.get("direction", 1))
+
+
+@register("otp")
+def _otp(key) -> Cipher:
+    from otp import otpDecrypt, otpEncrypt
+
+    # Ciphertext travels as hex text
+    return _FunctionCipher(
+        lambda text: otpEncrypt(text, key).hex(),
+        lambda text: otpDecrypt(bytes.fromhex(text), key),
+    )
+
+
+@register("des")
+def _des(key) -> Cipher:
+    import base64
+
+    from des_backends import get_backend, pkcs5_pad, pkcs5_unpad
+
+    # Same settings as the image tool: CBC, zero IV, PKCS5, Base64 ciphertext
+    if len(key) != 8:
+        raise ValueError("The key must be exactly 8 characters (8 bytes).")
+    backend, key_bytes, iv = get_backend(), key.encode("utf-8"), b"\x00" * 8
+    return _FunctionCipher(
+        lambda text: base64.b64encode(
+            backend.encrypt_cbc(key_bytes, iv, pkcs5_pad(text.encode("utf-8")))
+        ).decode("ascii"),
+        lambda text: pkcs5_unpad(
+            backend.decrypt_cbc(key_bytes, iv, base64.b64decode(text))
+        ).decode("utf-8"),
+    )
+
+
+# ---------- PUBLIC METHODS ----------
+@functools.lru_cache(maxsize=256)
+def _cached_cipher(name: str, key_json: str) -> Cipher:
+    return REGISTRY[name](json.loads(key_json))
+
+
+def get_cipher(name: str, key) -> Cipher:
+    """Return the cipher for (name, key), built once and then reused."""
+    if name not in REGISTRY:
+        raise ValueError(f"Unknown algorithm '{name}'. Options: {sorted(REGISTRY)}")
+    return _cached_cipher(name, json.dumps(key, sort_keys=True))
+
+
+def run(name: str, key, text: str, mode: str = "encrypt") -> str:
+    """Encrypt or decrypt text with a registered algorithm."""
+    cipher = get_cipher(name, key)
+    if mode == "encrypt":
+        return cipher.encrypt(text)
+    if mode == "decrypt":
+        return cipher.decrypt(text)
+    raise ValueError("Mode must be 'encrypt' or 'decrypt'")
+
+
+def run_record(record: dict) -> dict:
+    """Process one batch record; errors are reported instead of raised."""
+    result = {"id": record.get("id")}
+    try:
+        mode = record.get("mode", "encrypt")
+        result["result"] = run(record["algorithm"], record["key"], record["text"], mode)
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+    return result
+
+
+def _run_records(records: list[dict]) -> list[dict]:
+    return [run_record(record) for record in records]
+
+
+def run_batch(records, workers: int = 1, chunksize: int = 64, max_pending: int = None):
+    """Yield results for an iterable of records, in order.
+    With workers > 1 records are sent in chunks to a process pool; each worker
+    keeps its own cipher cache, so repeated keys are only set up once per
+    worker. At most `max_pending` chunks (4 per worker by default) are in
+    flight, so the input is read only as fast as it is processed."""
+    if workers == 1:
+        yield from map(run_record, records)
+        return
+    max_pending = max_pending or workers * 4
+    records = iter(records)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = collections.deque()
+        while chunk := list(itertools.islice(records, chunksize)):
+            pending.append(pool.submit(_run_records, chunk))
+            if len(pending) >= max_pending:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def parse_key(algorithm: str, value: str):
+    """Key given as text on a command line. It is JSON only for algorithms
+    whose key is structured (and Vigenere options given as an object), so a
+    key made of digits stays text for Playfair, OTP and DES."""
+    if algorithm in JSON_KEYS or (algorithm == "vigenere" and value.lstrip().startswith("{")):
+        return json.loads(value)
+    return value
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Batch front-end for the ciphers")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    for mode in ("encrypt", "decrypt"):
+        p = sub.add_parser(mode, help=f"{mode} a file or stdin")
+        p.add_argument("algorithm", choices=sorted(REGISTRY))
+        p.add_argument("--key", required=True, help="JSON for structured keys, else text")
+        p.add_argument("-i", "--input", default="-", help="input file (default stdin)")
+        p.add_argument("-o", "--output", default="-", help="output (default stdout)")
+
+    p = sub.add_parser("batch", help="process JSON-lines records")
+    p.add_argument("-i", "--input", default="-", help="records file (default stdin)")
+    p.add_argument("-o", "--output", default="-", help="results (default stdout)")
+    p.add_argument("--workers", type=int, default=1, help="worker processes")
+
+    args = parser.parse_args(argv)
+    if args.command != "batch":
+        try:
+            args.key = parse_key(args.algorithm, args.key)
+        except json.JSONDecodeError as e:
+            parser.error(f"--key for {args.algorithm} must be JSON: {e}")
+    src = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+    dst = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    try:
+        if args.command == "batch":
+            records = (json.loads(line) for line in src if line.strip())
+            for result in run_batch(records, args.workers):
+                dst.write(json.dumps(result, ensure_ascii=False) + "\n")
+        else:
+            dst.write(run(args.algorithm, args.key, src.read(), args.command))
+    finally:
+        if src is not sys.stdin:
+            src.close()
+        if dst is not sys.stdout:
+            dst.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,249 @@
+"""
+Author: jpastor
+Date: 2026-10-17
+Caesar and Vigenere key recovery using letter-frequency statistics.
+Caesar shifts are scored all at once with a chi-squared test over a letter
+histogram, so no candidate decryption is needed. Vigenere periods are
+estimated with Kasiski and the index of coincidence, then each column is
+solved as an independent Caesar cipher.
+"""
+
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from math import ceil
+
+import numpy as np
+
+from caesar import caesar_decrypt
+from vigenere import vigenere_decrypt
+
+# Relative frequencies of the letters A-Z in English text
+ENGLISH_FREQ = np.array(
+    [
+        0.08167, 0.01492, 0.02782, 0.04253, 0.12702, 0.02228, 0.02015,
+        0.06094, 0.06966, 0.00153, 0.00772, 0.04025, 0.02406, 0.06749,
+        0.07507, 0.01929, 0.00095, 0.05987, 0.06327, 0.09056, 0.02758,
+        0.00978, 0.02360, 0.00150, 0.01974, 0.00074,
+    ]
+)
+ENGLISH_IC = float(np.sum(ENGLISH_FREQ**2))  # ~0.066
+RANDOM_IC = 1 / 26
+
+# A period is accepted when its decryption scores within this factor of the
+# best one; longer periods always fit a little better just by having shorter
+# columns, so among the accepted periods the best ranked by estimate_periods
+# wins, and a shorter one only if it divides it (see _choose_key)
+CHI_TOLERANCE = 1.75
+KEY_AGREEMENT = 0.75  # fraction of columns a shorter key must match
+
+# (shift, letter) -> index of the letter once the shift is undone
+_SHIFT_INDEX = (np.arange(26)[:, None] + np.arange(26)[None, :]) % 26
+
+
+# PRIVATE METHODS
+def _letters(text: str) -> tuple[np.ndarray, np.ndarray]:
+    """Return the letters of text as numbers 0-25 and their positions in text.
+    Positions are kept because the Vigenere key advances on every character,
+    not only on letters."""
+    # One byte per character keeps positions aligned with the original str
+    raw = np.frombuffer(text.encode("ascii", "replace").upper(), dtype=np.uint8)
+    positions = np.flatnonzero((raw >= ord("A")) & (raw <= ord("Z")))
+    return raw[positions].astype(np.intp) - ord("A"), positions
+
+
+def _histogram(values: np.ndarray) -> np.ndarray:
+    return np.bincount(values, minlength=26)
+
+
+def _chi_squared_all_shifts(counts: np.ndarray) -> np.ndarray:
+    """Chi-squared score of every shift against English, from one histogram."""
+    total = counts.sum()
+    if total == 0:
+        return np.zeros(26)
+    observed = counts[_SHIFT_INDEX]  # row s = histogram after undoing shift s
+    expected = ENGLISH_FREQ * total
+    return np.sum((observed - expected) ** 2 / expected, axis=1)
+
+
+def _index_of_coincidence(counts: np.ndarray) -> float:
+    total = counts.sum()
+    if total < 2:
+        return 0.0
+    return float(np.sum(counts * (counts - 1)) / (total * (total - 1)))
+
+
+def _valid_period(period: int, t: int, length: int) -> bool:
+    """expand_key_with_t repeats the key ceil(length / t) times, so a key of
+    this length only covers the whole text when period * ceil(length / t) >= length."""
+    return period * ceil(length / t) >= length
+
+
+def _solve_period(args) -> tuple[int, str, float]:
+    """Solve every column of a candidate period (runs in a worker process).
+    The score is the chi-squared of the whole decrypted text, so multiples of
+    the true period do not win just by fitting shorter columns."""
+    letters, positions, period = args
+    columns = positions % period
+    shifts = np.empty(period, dtype=np.intp)
+    for column in range(period):
+        counts = _histogram(letters[columns == column])
+        shifts[column] = int(np.argmin(_chi_squared_all_shifts(counts)))
+    plain = (letters - shifts[columns]) % 26
+    score = float(_chi_squared_all_shifts(_histogram(plain))[0])
+    key = "".join(chr(int(s) + ord("A")) for s in shifts)
+    return period, key, score
+
+
+# PUBLIC METHODS
+def caesar_scores(ciphertext: str) -> np.ndarray:
+    """Chi-squared score of each of the 26 shifts (lower is better)."""
+    letters, _ = _letters(ciphertext)
+    return _chi_squared_all_shifts(_histogram(letters))
+
+
+def crack_caesar(ciphertext: str, top: int = 1) -> list[tuple[int, float, str]]:
+    """Return the best `top` (shift, score, plaintext) candidates."""
+    scores = caesar_scores(ciphertext)
+    best = np.argsort(scores, kind="stable")[:top]
+    return [
+        (int(s), float(scores[s]), caesar_decrypt(ciphertext, int(s))) for s in best
+    ]
+
+
+def kasiski(ciphertext: str, max_period: int = 20, ngram: int = 3) -> Counter:
+    """Count how many distances between repeated n-grams each period divides."""
+    letters, positions = _letters(ciphertext)
+    seen = {}
+    votes = Counter()
+    for i in range(len(letters) - ngram + 1):
+        # Only n-grams of letters that are contiguous in the original text
+        if positions[i + ngram - 1] - positions[i] != ngram - 1:
+            continue
+        gram = tuple(letters[i : i + ngram])
+        start = int(positions[i])
+        if gram in seen:
+            distance = start - seen[gram]
+            for period in range(2, max_period + 1):
+                if distance % period == 0:
+                    votes[period] += 1
+        seen[gram] = start
+    return votes
+
+
+def period_ic(ciphertext: str, max_period: int = 20) -> dict[int, float]:
+    """Average index of coincidence of the columns for each candidate period."""
+    letters, positions = _letters(ciphertext)
+    result = {}
+    for period in range(1, max_period + 1):
+        columns = positions % period
+        ics = [
+            _index_of_coincidence(_histogram(letters[columns == c]))
+            for c in range(period)
+        ]
+        result[period] = sum(ics) / period
+    return result
+
+
+def estimate_periods(
+    ciphertext: str, t: int = 1, max_period: int = 20, candidates: int | None = None
+) -> list[int]:
+    """Rank key lengths combining Kasiski votes and index of coincidence.
+    Periods that expand_key_with_t could not expand to the text length with
+    the given t are discarded."""
+    length = len(ciphertext)
+    ics = period_ic(ciphertext, max_period)
+    votes = kasiski(ciphertext, max_period)
+    total_votes = sum(votes.values()) or 1
+
+    ranked = []
+    for period, ic in ics.items():
+        if not _valid_period(period, t, length):
+            continue
+        # 1.0 when the columns look like English, 0.0 when they look random
+        ic_score = (ic - RANDOM_IC) / (ENGLISH_IC - RANDOM_IC)
+        ranked.append((ic_score + votes[period] / total_votes, period))
+
+    ranked.sort(key=lambda item: (-item[0], item[1]))
+    return [period for _, period in ranked[:candidates]]
+
+
+def crack_vigenere(
+    ciphertext: str,
+    t: int = 1,
+    max_period: int = 20,
+    candidates: int | None = None,
+    workers: int | None = None,
+) -> tuple[str, str]:
+    """Recover (key, plaintext) for a Vigenere ciphertext.
+    Candidate periods are solved in parallel; workers=1 runs inline."""
+    letters, positions = _letters(ciphertext)
+    if len(letters) == 0:
+        raise ValueError("Ciphertext has no letters to analyze")
+
+    periods = estimate_periods(ciphertext, t, max_period, candidates)
+    if not periods:
+        raise ValueError(f"No key length up to {max_period} is valid for t={t}")
+    jobs = [(letters, positions, period) for period in periods]
+
+    if workers == 1 or len(jobs) == 1:
+        results = list(map(_solve_period, jobs))
+    else:
+        workers = workers or min(len(jobs), os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_solve_period, jobs))
+
+    key = _shortest_repetition(_choose_key(results))
+    return key, vigenere_decrypt(ciphertext, key, t)
+
+
+def _choose_key(results) -> str:
+    """Key of the best ranked period that scores within CHI_TOLERANCE of the
+    best score (results follow the estimate_periods ranking). A shorter
+    accepted period replaces it only when it divides that period and its
+    key, repeated, matches the longer key in at least KEY_AGREEMENT of the
+    columns (the longer key has shorter columns, so a few may be wrong)."""
+    best = min(score for _, _, score in results)
+    accepted = [(period, key) for period, key, score in results if score <= best * CHI_TOLERANCE]
+    period, key = accepted[0]
+    for short, short_key in sorted(accepted):
+        if short >= period or period % short:
+            continue
+        repeated = short_key * (period // short)
+        same = sum(a == b for a, b in zip(repeated, key))
+        if same >= KEY_AGREEMENT * period:
+            return short_key
+    return key
+
+
+def _shortest_repetition(key: str) -> str:
+    """Reduce a key like 'ABCABC' to 'ABC'."""
+    for size in range(1, len(key) + 1):
+        if len(key) % size == 0 and key[:size] * (len(key) // size) == key:
+            return key[:size]
+    return key
+
+
+def main():
+    """Main function to run the cryptanalysis tools."""
+    print("=== Caesar / Vigenere Cryptanalysis ===")
+    choice = input("Attack (C)aesar or (V)igenere? ").strip().upper()
+    text = input("Enter the ciphertext: ")
+
+    if choice == "C":
+        shift, score, plaintext = crack_caesar(text)[0]
+        print("\n=== Result ===")
+        print(f"Shift    : {shift} (chi-squared {score:.2f})")
+        print(f"Plaintext: {plaintext}")
+    elif choice == "V":
+        t = int(input("Enter the parameter t (default 1): ").strip() or 1)
+        key, plaintext = crack_vigenere(text, t)
+        print("\n=== Result ===")
+        print(f"Key      : {key}")
+        print(f"Plaintext: {plaintext}")
+    else:
+        print("Invalid option. Please choose 'C' or 'V'.")
+
+
+if __name__ == "__main__":
+    main()
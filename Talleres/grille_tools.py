@@ -0,0 +1,217 @@
+"""
+Author: jpastor
+Date: 2026-10-17
+Toolkit for turning grille keys.
+A grille of size n is stored as a bitmask of n*n bits, bit r*n + c being
+the cell (r, c). Rotating the grille moves every cell around an orbit of 4
+cells, so a grille is valid when it has exactly one hole in every orbit:
+then the 4 rotations cover every cell exactly once. For odd sizes the
+center cell is its own orbit; it can never be covered exactly once, so it
+must not be a hole and is left unused.
+Since every orbit is independent, there are 4 ** (n*n // 4) valid grilles,
+and random grilles or the full list are built by picking one cell per orbit.
+"""
+
+import functools
+import itertools
+import random
+
+MAX_ENUMERATE = 6  # 4 ** 9 = 262144 grilles; size 8 already has 4 ** 16
+
+# ---------- PRIVATE METHODS ----------
+@functools.lru_cache(maxsize=64)
+def _rotation(size: int, direction: int = 1) -> tuple[int, ...]:
+    """Cell index -> cell index after one rotation (as in rotate_grille)."""
+    table = []
+    for r in range(size):
+        for c in range(size):
+            # np.rot90(g, -1) sends (r, c) to (c, size-1-r); np.rot90(g, 1)
+            # sends it to (size-1-c, r)
+            row, col = (c, size - 1 - r) if direction == 1 else (size - 1 - c, r)
+            table.append(row * size + col)
+    return tuple(table)
+
+
+@functools.lru_cache(maxsize=64)
+def orbits(size: int) -> tuple[tuple[int, ...], ...]:
+    """Orbits of 4 cells under clockwise rotation, in reading order of their
+    first cell. The center of an odd grille is not included."""
+    turn = _rotation(size)
+    seen = set()
+    result = []
+    for cell in range(size * size):
+        if cell in seen:
+            continue
+        orbit = [cell]
+        while turn[orbit[-1]] != cell:
+            orbit.append(turn[orbit[-1]])
+        seen.update(orbit)
+        if len(orbit) == 4:
+            result.append(tuple(orbit))
+    return tuple(result)
+
+
+@functools.lru_cache(maxsize=64)
+def _orbit_masks(size: int) -> tuple[tuple[int, ...], ...]:
+    """For each orbit, the 4 one-hole masks it allows."""
+    return tuple(tuple(1 << cell for cell in orbit) for orbit in orbits(size))
+
+
+def _covered(size: int) -> int:
+    """Mask of the cells a valid grille has to cover."""
+    full = (1 << size * size) - 1
+    if size % 2:
+        full &= ~(1 << (size * size // 2))  # center cell
+    return full
+
+
+# ---------- PUBLIC METHODS ----------
+def holes_to_mask(size: int, holes) -> int:
+    """Bitmask of a list of (row, column) holes."""
+    mask = 0
+    for r, c in holes:
+        if not (0 <= r < size and 0 <= c < size):
+            raise ValueError(f"Hole ({r}, {c}) is outside the {size}x{size} grille")
+        mask |= 1 << (r * size + c)
+    return mask
+
+
+def mask_to_holes(size: int, mask: int) -> list[tuple[int, int]]:
+    """(row, column) holes of a bitmask, in reading order."""
+    return [divmod(cell, size) for cell in range(size * size) if mask >> cell & 1]
+
+
+def rotate_mask(size: int, mask: int, direction: int = 1) -> int:
+    """Rotate a grille mask once (1 = clockwise, as in turning_grille)."""
+    turn = _rotation(size, 1 if direction == 1 else 0)
+    rotated = 0
+    for cell in range(size * size):
+        if mask >> cell & 1:
+            rotated |= 1 << turn[cell]
+    return rotated
+
+
+def grille_errors(size: int, grille) -> list[str]:
+    """Reasons why a grille (hole list or mask) is not valid; empty if valid.
+    Runs in O(size^2)."""
+    if isinstance(grille, int):
+        holes = mask_to_holes(size, grille)
+    else:
+        holes = list(grille)
+        if len(set(holes)) != len(holes):
+            return ["The same hole is listed more than once"]
+    try:
+        mask = holes_to_mask(size, holes)
+    except ValueError as e:
+        return [str(e)]
+
+    errors = []
+    if size % 2 and mask >> (size * size // 2) & 1:
+        errors.append("The center cell of an odd grille cannot be a hole")
+    for orbit in orbits(size):
+        count = sum(mask >> cell & 1 for cell in orbit)
+        cells = [divmod(cell, size) for cell in orbit]
+        if count == 0:
+            errors.append(f"Cells {cells} are never under a hole")
+        elif count > 1:
+            errors.append(f"Cells {cells} are under a hole more than once")
+    return errors
+
+
+def is_valid_grille(size: int, grille) -> bool:
+    """True if the 4 rotations cover every cell exactly once (hole list or mask)."""
+    if isinstance(grille, int):
+        mask = grille
+    else:
+        holes = list(grille)
+        if len(set(holes)) != len(holes):
+            return False
+        try:
+            mask = holes_to_mask(size, holes)
+        except ValueError:
+            return False
+    # Valid when the rotations never overlap and together cover every cell
+    union, total = 0, 0
+    for _ in range(4):
+        union |= mask
+        total += mask.bit_count()
+        mask = rotate_mask(size, mask)
+    return union == _covered(size) and total == union.bit_count()
+
+
+def validate_grille(size: int, holes) -> None:
+    """Raise ValueError describing every problem of an invalid grille."""
+    errors = grille_errors(size, holes)
+    if errors:
+        raise ValueError("Invalid grille: " + "; ".join(errors))
+
+
+def count_grilles(size: int, fixed=(), blocked=()) -> int:
+    """Number of valid grilles, optionally with some holes fixed and some
+    cells that cannot be holes. Each orbit contributes its allowed choices."""
+    fixed_mask = holes_to_mask(size, fixed)
+    blocked_mask = holes_to_mask(size, blocked)
+    total = 1
+    for orbit in orbits(size):
+        forced = [cell for cell in orbit if fixed_mask >> cell & 1]
+        free = [cell for cell in orbit if not blocked_mask >> cell & 1]
+        if forced:
+            # A fixed hole is the only choice, unless it clashes
+            total *= len(forced) == 1 and forced[0] in free
+        else:
+            total *= len(free)
+    return total
+
+
+def random_grille(size: int, seed=None) -> list[tuple[int, int]]:
+    """A uniformly random valid grille as a list of (row, column) holes."""
+    rng = random.Random(seed)
+    cells = sorted(rng.choice(orbit) for orbit in orbits(size))
+    return [divmod(cell, size) for cell in cells]
+
+
+def random_grilles(size: int, count: int, seed=None) -> list[int]:
+    """`count` random valid grilles as masks, for generating keys in bulk."""
+    rng = random.Random(seed)
+    choices = _orbit_masks(size)
+    return [sum(rng.choice(masks) for masks in choices) for _ in range(count)]
+
+
+@functools.lru_cache(maxsize=32)
+def _suffix_masks(size: int, start: int) -> tuple[int, ...]:
+    """Every combination of one hole per orbit for orbits[start:]."""
+    masks = _orbit_masks(size)
+    if start == len(masks):
+        return (0,)
+    rest = _suffix_masks(size, start + 1)
+    return tuple(choice | tail for choice in masks[start] for tail in rest)
+
+
+def enumerate_grilles(size: int) -> tuple[int, ...]:
+    """All valid grilles of a small size as masks (memoized per size)."""
+    if size > MAX_ENUMERATE:
+        raise ValueError(
+            f"Size {size} has {count_grilles(size)} grilles; "
+            f"enumerate up to size {MAX_ENUMERATE} or use random_grilles"
+        )
+    return _suffix_masks(size, 0)
+
+
+def iter_grilles(size: int):
+    """Lazily yield every valid grille as a list of holes (any size)."""
+    for cells in itertools.product(*orbits(size)):
+        yield [divmod(cell, size) for cell in sorted(cells)]
+
+
+def main():
+    print("=== Turning grille toolkit ===")
+    size = int(input("Grid size (n for nxn): "))
+    print(f"Valid grilles of size {size}: {count_grilles(size)}")
+    holes = random_grille(size)
+    print(f"Random valid grille: {holes}")
+    for r in range(size):
+        print(" ".join("1" if (r, c) in holes else "0" for c in range(size)))
+
+
+if __name__ == "__main__":
+    main()
@@ -6,9 +6,15 @@ Try it with key: [[11 8]
                  [3 7]]
 """
 
-import numpy as np
+from __future__ import annotations
+
 from math import gcd
 
+from lazy import lazy_import
+from modular import det_mod_m, inverse_key, matmul_mod
+
+np = lazy_import("numpy")  # loaded on first use
+
 
 # PRIVATE METHODS
 def _get_matrix_from_input() -> list[list[int]]:
@@ -25,48 +31,17 @@ def _get_matrix_from_input() -> list[list[int]]:
     return np.array(key)
 
 
-def _mod_inverse(a, m):
-    """Compute the modular inverse of a under modulo m using Extended Euclidean Algorithm."""
-    a = a % m
-    for x in range(1, m):
-        if (a * x) % m == 1:
-            return x
-    return ValueError(f"Modular inverse does not exist for {a} mod {m}")
-
-
 def _validate_key(key: list[list[int]]) -> None:
     """Validate that the key is a square matrix and invertible modulo 26."""
     key = np.array(key)
-    det = int(round(np.linalg.det(key)))  # Determinant of the key matrix
-    det_mod = det % 26
+    if key.ndim != 2 or key.shape[0] != key.shape[1]:
+        raise ValueError("Key matrix must be square")
+    det_mod = det_mod_m(key, 26)  # Exact determinant modulo 26
     if det_mod == 0 or gcd(det_mod, 26) != 1:
         raise ValueError("Key matrix is not invertible modulo 26")
     return key
 
 
-def _minor(matrix, i, j):
-    """Calculate the minor of a matrix by removing the i-th row and j-th column."""
-    mat = np.delete(matrix, i, axis=0)  # Delete i-th row
-    mat = np.delete(mat, j, axis=1)  # Delete j-th column
-    return mat
-
-
-def _cofactor_matrix(matrix):
-    """Calculate the cofactor matrix of a square matrix."""
-    n = matrix.shape[0]
-    cof_matrix = np.zeros((n, n), dtype=int)
-    for i in range(n):
-        for j in range(n):
-            minor_ij = _minor(matrix, i, j)
-            cof_matrix[i, j] = ((-1) ** (i + j)) * int(round(np.linalg.det(minor_ij)))
-    return cof_matrix
-
-
-def _adjugate(matrix):
-    """Calculate the adjugate of a square matrix."""
-    return _cofactor_matrix(matrix).T
-
-
 # PUBLIC METHODS
 def hill_cipher_encrypt(text: str, key: list[list[int]]) -> str:
     key = _validate_key(key)
@@ -81,19 +56,12 @@ def hill_cipher_encrypt(text: str, key: list[list[int]]) -> str:
     if len(text) % n != 0:
         text += "X" * (n - (len(text) % n))  # Padding with 'X' if necessary
 
-    result = []
     # Convert text to numbers (A=0, B=1, ..., Z=25)
-    text_num = [ord(c) - ord("A") for c in text]
-    for i in range(0, len(text_num), n):
+    text_num = np.array([ord(c) - ord("A") for c in text], dtype=np.int64)
+    blocks = text_num.reshape(-1, n)  # One row per block of n letters
 
-        block = np.array(
-            text_num[i : i + n]
-        )  # Create a block vector for the current segment of text
-
-        encrypted_block = (
-            np.dot(block, key) % 26
-        )  # Encrypt the block using the key matrix
-        result.extend(encrypted_block)
+    # Encrypt every block with a single matrix product
+    result = matmul_mod(blocks, key, 26).ravel().tolist()
 
     encrypted_text = [
         chr(num + ord("A")) for num in result
@@ -119,20 +87,13 @@ def hill_cipher_decrypt(ciphertext: str, key: list[list[int]]) -> str:
     key = _validate_key(key)
     n = len(key)
 
-    det = int(round(np.linalg.det(key)))  # Determinant of the key matrix
-    det_mod = det % 26
-    det_inv = _mod_inverse(det_mod, 26)  # Modular inverse of the determinant
-
-    adj = _adjugate(key)  # Adjugate of the key matrix
-    key_inv = ((det_inv * adj) % 26).astype(int)  # Inverse key matrix modulo 26
-
-    text_num = [ord(c) - ord("A") for c in ciphertext]
-    text = []
+    key_inv = inverse_key(key, 26)  # Inverse key matrix modulo 26 (cached)
 
-    for i in range(0, len(text_num), n):
-        block = np.array(text_num[i : i + n])
-        decrypted_block = np.dot(block, key_inv) % 26
-        text.extend(decrypted_block)
+    text_num = np.array([ord(c) - ord("A") for c in ciphertext], dtype=np.int64)
+    if len(text_num) % n != 0:
+        raise ValueError(f"Ciphertext length must be a multiple of {n}")
+    blocks = text_num.reshape(-1, n)
+    text = matmul_mod(blocks, key_inv, 26).ravel().tolist()
 
     decrypted_text = [chr(num + ord("A")) for num in text]
 
@@ -0,0 +1,192 @@
+"""
+Author: jpastor
+Date: 2026-10-17
+Known-plaintext attack on the Hill cipher.
+HillCipher encrypts each block (row vector) p as c = p K mod 26, so n
+plaintext blocks stacked as a matrix P give C = P K and K = P^-1 C. P only
+has to be invertible, but mod 26 that fails whenever det(P) is even or a
+multiple of 13. Since 26 = 2 * 13 and both are primes, the system is solved
+separately over GF(2) and GF(13), where plain Gaussian elimination works and
+each modulus may use a different subset of blocks, and the two keys are
+joined with the Chinese remainder theorem.
+Candidate subsets of n blocks are eliminated all at once with NumPy (and
+optionally split over a process pool); a candidate key is only accepted if
+it maps every known plaintext block to its ciphertext block.
+"""
+
+from __future__ import annotations
+
+import itertools
+import random
+from concurrent.futures import ProcessPoolExecutor
+from math import gcd
+
+from lazy import lazy_import
+from modular import det_mod_m, solve_mod_prime
+
+np = lazy_import("numpy")  # loaded on first use
+
+PRIMES = (2, 13)
+PAD = ord("X") - ord("A")
+BATCH = 4096  # candidate subsets eliminated together
+SAMPLE = 32  # blocks every candidate is checked on before the whole corpus
+CHECK_BLOCKS = 1024  # corpus blocks checked at once against the survivors
+
+
+# ---------- PRIVATE METHODS ----------
+def _letters(text: str) -> list[int]:
+    return [ord(ch) - ord("A") for ch in text.upper() if "A" <= ch <= "Z"]
+
+
+def _corpus_blocks(pairs, n: int):
+    """Stack every (plaintext, ciphertext) pair into (m x n) block matrices.
+    Plaintext is padded with X as HillCipher does."""
+    plain, cipher = [], []
+    for plaintext, ciphertext in pairs:
+        p, c = _letters(plaintext), _letters(ciphertext)
+        p += [PAD] * (-len(p) % n)
+        usable = min(len(p), len(c)) // n * n
+        plain += p[:usable]
+        cipher += c[:usable]
+    shape = (-1, n)
+    return (
+        np.array(plain, dtype=np.int64).reshape(shape),
+        np.array(cipher, dtype=np.int64).reshape(shape),
+    )
+
+
+def _candidates(m: int, n: int, limit: int, seed) -> list[tuple[int, ...]]:
+    """Subsets of n block indices: consecutive windows first, then random ones
+    (every subset when there are few enough)."""
+    windows = [tuple(range(i, i + n)) for i in range(0, m - n + 1)]
+    total = 1
+    for k in range(n):
+        total = total * (m - k) // (k + 1)
+    if total <= limit:
+        rest = itertools.combinations(range(m), n)
+    else:
+        rng = random.Random(seed)
+        rest = (tuple(sorted(rng.sample(range(m), n))) for _ in range(limit))
+    seen = set(windows)
+    subsets = list(windows)
+    for subset in rest:
+        if subset not in seen:
+            seen.add(subset)
+            subsets.append(subset)
+        if len(subsets) >= limit:
+            break
+    return subsets
+
+
+def _matches(plain, cipher, keys, p) -> np.ndarray:
+    """Which keys map every plaintext block to its ciphertext block mod p.
+    Works through the blocks in chunks, dropping keys as soon as they fail,
+    so memory stays at (keys x CHECK_BLOCKS x n) whatever the corpus size."""
+    alive = np.arange(len(keys))
+    for start in range(0, len(plain), CHECK_BLOCKS):
+        p_part = plain[start : start + CHECK_BLOCKS]
+        c_part = cipher[start : start + CHECK_BLOCKS] % p
+        ok = ((p_part @ keys[alive]) % p == c_part).all(axis=(1, 2))
+        alive = alive[ok]
+        if not len(alive):
+            break
+    result = np.zeros(len(keys), dtype=bool)
+    result[alive] = True
+    return result
+
+
+def _test_candidates(args):
+    """Return a key mod p that explains the whole corpus, or None."""
+    plain, cipher, subsets, p = args
+    # A small spread-out sample rejects almost every wrong key cheaply
+    sample = np.linspace(0, len(plain) - 1, min(SAMPLE, len(plain))).astype(np.intp)
+    for start in range(0, len(subsets), BATCH):
+        index = np.array(subsets[start : start + BATCH])
+        keys, ok = solve_mod_prime(plain[index], cipher[index], p)
+        keys = keys[ok]
+        if not len(keys):
+            continue
+        keys = keys[_matches(plain[sample], cipher[sample], keys, p)]
+        # Only the survivors are checked against every known block
+        for key in keys:
+            if _matches(plain, cipher, key[None], p)[0]:
+                return key
+    return None
+
+
+def _key_mod_prime(plain, cipher, p, limit, workers, seed):
+    subsets = _candidates(len(plain), plain.shape[1], limit, seed)
+    if workers == 1:
+        return _test_candidates((plain, cipher, subsets, p))
+    size = -(-len(subsets) // workers)
+    jobs = [(plain, cipher, subsets[i : i + size], p) for i in range(0, len(subsets), size)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for key in pool.map(_test_candidates, jobs):
+            if key is not None:
+                return key
+    return None
+
+
+# ---------- PUBLIC METHODS ----------
+def crt_combine(k2: np.ndarray, k13: np.ndarray) -> np.ndarray:
+    """The matrix mod 26 that is k2 mod 2 and k13 mod 13."""
+    # 13 = 1 mod 2 and 0 mod 13; 14 = 0 mod 2 and 1 mod 13
+    return (13 * k2 + 14 * k13) % 26
+
+
+def recover_key(pairs, n: int, limit: int = 20000, workers: int = 1, seed=0) -> np.ndarray:
+    """Recover the n x n key from known (plaintext, ciphertext) pairs.
+    Raises ValueError if the corpus does not determine an invertible key."""
+    if isinstance(pairs[0], str):
+        pairs = [pairs]
+    plain, cipher = _corpus_blocks(pairs, n)
+    if len(plain) < n:
+        raise ValueError(f"At least {n} blocks of {n} letters are needed")
+
+    parts = []
+    for p in PRIMES:
+        key = _key_mod_prime(plain, cipher, p, limit, workers, seed)
+        if key is None:
+            raise ValueError(
+                f"The known blocks do not determine the key mod {p}; "
+                "more known plaintext is needed"
+            )
+        parts.append(key)
+    key = crt_combine(*parts)
+
+    if not ((plain @ key) % 26 == cipher).all():
+        raise ValueError("The recovered key does not match the corpus")
+    if gcd(det_mod_m(key, 26), 26) != 1:
+        raise ValueError("The corpus fits a key that is not invertible modulo 26")
+    return key
+
+
+def crack_hill(pairs, max_n: int = 6, **options) -> np.ndarray:
+    """Try key sizes 1..max_n and return the first key that explains the corpus."""
+    for n in range(1, max_n + 1):
+        try:
+            return recover_key(pairs, n, **options)
+        except ValueError:
+            continue
+    raise ValueError(f"No Hill key of size up to {max_n} matches the corpus")
+
+
+def main():
+    print("=== Hill known-plaintext attack ===")
+    plaintext = input("Known plaintext: ")
+    ciphertext = input("Matching ciphertext: ")
+    size = input("Key size n (empty to try 1-6): ").strip()
+    try:
+        if size:
+            key = recover_key([(plaintext, ciphertext)], int(size))
+        else:
+            key = crack_hill([(plaintext, ciphertext)])
+    except ValueError as e:
+        print(f"❌ {e}")
+        return
+    print("Recovered key:")
+    print(key)
+
+
+if __name__ == "__main__":
+    main()
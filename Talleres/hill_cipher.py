@@ -2,105 +2,237 @@
 Author: jpastor
 Date: 2025-09-20
 Hill Cipher implemented as a class.
-Works only with letters A-Z (not numbers or special characters).
+By default it works with letters A-Z modulo 26 (not numbers or special
+characters). Any other alphabet can be given, and the modulus is then its
+length (e.g. A-Z, 0-9 and space for mod 37); characters outside the
+alphabet are dropped. With modulus 256 and no alphabet it works directly on
+bytes (bytes, bytearray or memoryview).
 """
 
-import numpy as np
+from __future__ import annotations
+
+import functools
 from math import gcd
 
+from lazy import lazy_import
+from modular import det_mod_m, inverse_key, matmul_mod, unit_lower_inverse, units
+
+np = lazy_import("numpy")  # loaded on first use
+
+LETTERS = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+BYTE_MODULUS = 256
+
+
+@functools.lru_cache(maxsize=32)
+def _alphabet_tables(alphabet: str) -> dict:
+    """Lookup tables for an alphabet, built once per alphabet.
+    If the alphabet has no lowercase characters, lowercase input is accepted
+    too; when it only has letters (like the default A-Z) the case of the
+    input is also kept in the output."""
+    fold = any(ch.isupper() for ch in alphabet) and not any(ch.islower() for ch in alphabet)
+    keep_case = fold and all(ch.isupper() for ch in alphabet)
+    lower = [ch.lower() if fold and len(ch.lower()) == 1 else ch for ch in alphabet]
+    size = max(map(ord, alphabet + "".join(lower))) + 1
+
+    encode = np.full(size, -1, dtype=np.int64)  # code point -> number
+    is_lower = np.zeros(size, dtype=bool)  # lowercase input whose case is kept
+    for number, (ch, low) in enumerate(zip(alphabet, lower)):
+        if low != ch:
+            encode[ord(low)] = number
+            is_lower[ord(low)] = keep_case
+        encode[ord(ch)] = number
+    decode = np.array([ord(ch) for ch in alphabet], dtype=np.uint32)
+    decode_lower = np.array([ord(ch) for ch in lower], dtype=np.uint32)
+    return {
+        "encode": encode,
+        "is_lower": is_lower,
+        "decode": decode,
+        "decode_lower": decode_lower,
+        "ascii": int(max(decode.max(), decode_lower.max())) < 128,
+    }
+
+
+def _random_keys(count: int, n: int, rng: np.random.Generator, m: int = 26):
+    """Build invertible keys as P @ L @ D @ U mod m with their inverses.
+    L and U are unit triangular and D holds units, so the determinant is
+    always a unit and no determinant has to be computed."""
+    unit_values, unit_inverses = units(m)
+    tril = np.tril(np.ones((n, n), dtype=bool), -1)
+    lower = np.where(tril, rng.integers(0, m, (count, n, n)), 0) + np.eye(n, dtype=np.int64)
+    upper = np.where(tril.T, rng.integers(0, m, (count, n, n)), 0) + np.eye(n, dtype=np.int64)
+    picks = rng.integers(0, len(unit_values), (count, n))
+    diag = np.array(unit_values)[picks]
+    perm = np.argsort(rng.random((count, n)), axis=1)
+    p_matrix = np.eye(n, dtype=np.int64)[perm]  # row i of P is e_perm[i]
+
+    keys = p_matrix @ lower % m * diag[:, None, :] % m @ upper % m
+
+    # (P L D U)^-1 = U^-1 D^-1 L^-1 P^T
+    lower_inv = unit_lower_inverse(lower, m)
+    upper_inv = unit_lower_inverse(upper.transpose(0, 2, 1), m).transpose(0, 2, 1)
+    diag_inv = np.array(unit_inverses)[picks]
+    inverses = (
+        upper_inv * diag_inv[:, None, :] % m @ lower_inv % m @ p_matrix.transpose(0, 2, 1)
+    ) % m
+    return keys, inverses
+
 
 class HillCipher:
-    def __init__(self, key: list[list[int]]):
-        """Initialize HillCipher with a given key matrix."""
+    def __init__(
+        self,
+        key: list[list[int]],
+        alphabet: str = None,
+        modulus: int = None,
+        pad=None,
+    ):
+        """Initialize HillCipher with a given key matrix.
+        alphabet: characters in number order (A-Z by default); the modulus is
+            its length. Use modulus=256 without an alphabet for bytes.
+        pad: character (or byte value) used to fill the last block."""
+        if alphabet is None and modulus == BYTE_MODULUS:
+            self.alphabet = None
+            self.pad = 0 if pad is None else int(pad)
+        else:
+            self.alphabet = LETTERS if alphabet is None else alphabet
+            if len(set(self.alphabet)) != len(self.alphabet):
+                raise ValueError("The alphabet has repeated characters")
+            if modulus not in (None, len(self.alphabet)):
+                raise ValueError(
+                    f"The modulus must be the alphabet length ({len(self.alphabet)}), "
+                    f"or {BYTE_MODULUS} without an alphabet"
+                )
+            if pad is None:
+                pad = "X" if "X" in self.alphabet else self.alphabet[0]
+            if pad not in self.alphabet:
+                raise ValueError("The padding character must be in the alphabet")
+            self._tables = _alphabet_tables(self.alphabet)
+            self.pad = self.alphabet.index(pad)
+        self.modulus = BYTE_MODULUS if self.alphabet is None else len(self.alphabet)
+
         self.key = self._validate_key(np.array(key))
         self.n = len(self.key)
+        # Smallest integer type that can hold a row times a column of the key
+        m = self.modulus - 1
+        self.dtype = np.int32 if self.n * m * m < 2**31 else np.int64
+        self._key_mod = (self.key % self.modulus).astype(self.dtype)
+        self._key_inv = None
 
     # ---------- PRIVATE METHODS ----------
-    def _mod_inverse(self, a: int, m: int) -> int:
-        """Compute modular inverse of a modulo m using Extended Euclidean Algorithm."""
-        a = a % m
-        for x in range(1, m):
-            if (a * x) % m == 1:
-                return x
-        raise ValueError(f"No modular inverse exists for {a} mod {m}")
-
     def _validate_key(self, key: np.ndarray) -> np.ndarray:
-        """Validate key is a square matrix and invertible modulo 26."""
-        det = int(round(np.linalg.det(key)))
-        det_mod = det % 26
-        if det_mod == 0 or gcd(det_mod, 26) != 1:
-            raise ValueError("Key matrix is not invertible modulo 26")
+        """Validate key is a square matrix and invertible modulo the modulus."""
+        if key.ndim != 2 or key.shape[0] != key.shape[1]:
+            raise ValueError("Key matrix must be square")
+        m = self.modulus
+        det_mod = det_mod_m(key, m)
+        if det_mod == 0 or gcd(det_mod, m) != 1:
+            raise ValueError(f"Key matrix is not invertible modulo {m}")
         return key
 
-    def _minor(self, matrix: np.ndarray, i: int, j: int) -> np.ndarray:
-        """Compute minor of a matrix by removing row i and column j."""
-        mat = np.delete(matrix, i, axis=0)
-        mat = np.delete(mat, j, axis=1)
-        return mat
-
-    def _cofactor_matrix(self, matrix: np.ndarray) -> np.ndarray:
-        """Compute cofactor matrix of a square matrix."""
-        n = matrix.shape[0]
-        cof_matrix = np.zeros((n, n), dtype=int)
-        for i in range(n):
-            for j in range(n):
-                minor_ij = self._minor(matrix, i, j)
-                cof_matrix[i, j] = ((-1) ** (i + j)) * int(round(np.linalg.det(minor_ij)))
-        return cof_matrix
-
-    def _adjugate(self, matrix: np.ndarray) -> np.ndarray:
-        """Compute adjugate (transpose of cofactor matrix)."""
-        return self._cofactor_matrix(matrix).T
-
-    def _process_text(self, text: str) -> tuple[list[int], list[bool]]:
-        """Convert text to numbers and save case flags."""
-        case_flags = [ch.islower() for ch in text if ch.isalpha()]
-        clean_text = "".join(ch.upper() for ch in text if ch.isalpha())
-        if len(clean_text) % self.n != 0:
-            clean_text += "X" * (self.n - (len(clean_text) % self.n))  # Padding
-        text_num = [ord(c) - ord("A") for c in clean_text]
-        return text_num, case_flags
-
-    def _restore_case(self, letters: list[str], case_flags: list[bool]) -> str:
-        """Restore original case to output text."""
-        return "".join(
-            ch.lower() if case_flags[i % len(case_flags)] else ch
-            for i, ch in enumerate(letters)
-        )
+    def _process_text(self, text) -> tuple[np.ndarray, np.ndarray]:
+        """Convert text (or bytes) to an (m x n) array of numbers and save case flags."""
+        if self.alphabet is None:
+            numbers = np.frombuffer(text, dtype=np.uint8).astype(self.dtype)
+            case_flags = None
+        else:
+            tables = self._tables
+            if text.isascii():
+                codes = np.frombuffer(text.encode("ascii"), dtype=np.uint8)
+            else:
+                codes = np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32)
+            codes = codes[codes < len(tables["encode"])]
+            numbers = tables["encode"][codes]
+            keep = numbers >= 0  # characters outside the alphabet are dropped
+            case_flags = tables["is_lower"][codes[keep]]
+            numbers = numbers[keep].astype(self.dtype)
+        if len(numbers) % self.n != 0:
+            padding = self.n - (len(numbers) % self.n)
+            numbers = np.concatenate([numbers, np.full(padding, self.pad, self.dtype)])
+        return numbers.reshape(-1, self.n), case_flags
+
+    def _restore_case(self, numbers: np.ndarray, case_flags: np.ndarray):
+        """Convert numbers back to characters (or bytes) and restore the case.
+        Padding added after the last input character keeps the alphabet's case."""
+        numbers = numbers.ravel()
+        if self.alphabet is None:
+            return numbers.astype(np.uint8).tobytes()
+        tables = self._tables
+        codes = tables["decode"][numbers]
+        flagged = len(case_flags)
+        if case_flags.any():
+            lowered = tables["decode_lower"][numbers[:flagged]]
+            codes[:flagged] = np.where(case_flags, lowered, codes[:flagged])
+        if tables["ascii"]:
+            return codes.astype(np.uint8).tobytes().decode("ascii")
+        return codes.tobytes().decode("utf-32-le")
+
+    def _multiply(self, blocks: np.ndarray, key: np.ndarray) -> np.ndarray:
+        """Multiply every block by the key in a single matmul."""
+        return matmul_mod(blocks, key, self.modulus)
+
+    def _apply_many(self, texts: list[str], key: np.ndarray) -> list[str]:
+        processed = [self._process_text(text) for text in texts]
+        if not processed:
+            return []
+        blocks = np.concatenate([b for b, _ in processed])
+        result = self._multiply(blocks, key)
+        # Split the result back into one array per message
+        bounds = np.cumsum([len(b) for b, _ in processed])[:-1]
+        return [
+            self._restore_case(part, flags)
+            for part, (_, flags) in zip(np.split(result, bounds), processed)
+        ]
 
     # ---------- PUBLIC METHODS ----------
-    def encrypt(self, text: str) -> str:
-        """Encrypt text using Hill cipher with the key matrix."""
-        text_num, case_flags = self._process_text(text)
-        result = []
+    @classmethod
+    def generate_key(cls, n: int, seed=None, modulus: int = 26) -> tuple[np.ndarray, np.ndarray]:
+        """Generate a random n x n key invertible modulo `modulus` and its inverse."""
+        keys, inverses = cls.generate_keys(1, n, seed, modulus)
+        return keys[0], inverses[0]
 
-        for i in range(0, len(text_num), self.n):
-            block = np.array(text_num[i : i + self.n])
-            encrypted_block = np.dot(block, self.key) % 26
-            result.extend(encrypted_block)
+    @staticmethod
+    def generate_keys(
+        count: int, n: int, seed=None, modulus: int = 26
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Generate `count` random keys at once; returns two (count, n, n) arrays."""
+        if n < 1:
+            raise ValueError("Key size must be at least 1")
+        return _random_keys(count, n, np.random.default_rng(seed), modulus)
 
-        encrypted_letters = [chr(num + ord("A")) for num in result]
-        return self._restore_case(encrypted_letters, case_flags)
+    @classmethod
+    def random(cls, n: int, seed=None, alphabet: str = None, modulus: int = None) -> "HillCipher":
+        """Create a cipher with a random key, its inverse already known."""
+        m = len(alphabet) if alphabet is not None else modulus or 26
+        key, key_inv = cls.generate_key(n, seed, m)
+        cipher = cls(key, alphabet, modulus)
+        cipher._key_inv = key_inv
+        return cipher
 
-    def decrypt(self, ciphertext: str) -> str:
-        """Decrypt text using Hill cipher with the key matrix."""
-        text_num, case_flags = self._process_text(ciphertext)
+    @property
+    def key_inv(self) -> np.ndarray:
+        """Inverse key modulo the modulus, computed once per (key, modulus)
+        and then reused."""
+        if self._key_inv is None:
+            self._key_inv = inverse_key(self.key, self.modulus)
+        return self._key_inv
 
-        det = int(round(np.linalg.det(self.key)))
-        det_mod = det % 26
-        det_inv = self._mod_inverse(det_mod, 26)
+    def encrypt(self, text: str) -> str:
+        """Encrypt text (or bytes in byte mode) using Hill cipher with the key matrix."""
+        blocks, case_flags = self._process_text(text)
+        return self._restore_case(self._multiply(blocks, self._key_mod), case_flags)
 
-        adj = self._adjugate(self.key)
-        key_inv = ((det_inv * adj) % 26).astype(int)
+    def decrypt(self, ciphertext: str) -> str:
+        """Decrypt text (or bytes in byte mode) using Hill cipher with the key matrix."""
+        blocks, case_flags = self._process_text(ciphertext)
+        key_inv = self.key_inv.astype(self.dtype)
+        return self._restore_case(self._multiply(blocks, key_inv), case_flags)
 
-        result = []
-        for i in range(0, len(text_num), self.n):
-            block = np.array(text_num[i : i + self.n])
-            decrypted_block = np.dot(block, key_inv) % 26
-            result.extend(decrypted_block)
+    def encrypt_many(self, texts: list[str]) -> list[str]:
+        """Encrypt many messages with one matmul over all of their blocks."""
+        return self._apply_many(texts, self._key_mod)
 
-        decrypted_letters = [chr(num + ord("A")) for num in result]
-        return self._restore_case(decrypted_letters, case_flags)
+    def decrypt_many(self, ciphertexts: list[str]) -> list[str]:
+        """Decrypt many messages with one matmul over all of their blocks."""
+        return self._apply_many(ciphertexts, self.key_inv.astype(self.dtype))
 
 
 # ---------- MAIN ----------
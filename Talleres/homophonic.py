@@ -1,5 +1,3 @@
-import random
-
 """
 Author: jpastor
 Date: 2025-10-04
@@ -7,13 +5,19 @@ Homophonic Substitution Cipher Example
 This implementation creates a homophonic substitution cipher where each letter can be mapped to multiple numbers.
 """
 
+import random
+
+from lazy import lazy_import
+
+np = lazy_import("numpy")  # loaded on first use
+
 
 def gen_layout(m=100, n=26, seed=23):
     """Generate a random layout mapping letters to multiple numbers."""
-    random.seed(seed)
+    rng = random.Random(seed)  # same sequence as random.seed(seed), no global state
     numbers = list(range(m))
     # Shuffle the numbers to create a random mapping
-    random.shuffle(numbers)
+    rng.shuffle(numbers)
 
     layout = {}
     step = m // n  # amount of numbers per letter
@@ -28,38 +32,124 @@ def gen_layout(m=100, n=26, seed=23):
     return layout
 
 
+class HomophonicCipher:
+    SPACE = -1  # marks a space in the letter lookup table
+
+    def __init__(self, layout, seed=None):
+        """Build the lookup tables for a layout once."""
+        self.layout = layout
+        self.letters = list(layout)
+        self.rng = np.random.default_rng(seed)
+
+        # Homophones as a padded (letters x max homophones) array
+        self.counts = np.array([len(layout[k]) for k in self.letters])
+        self.homophones = np.zeros((len(self.letters), max(self.counts, default=0)), dtype=np.int64)
+        for i, letter in enumerate(self.letters):
+            self.homophones[i, : self.counts[i]] = layout[letter]
+
+        # Character code -> row of self.homophones (or SPACE / -2 to skip)
+        size = max([ord(k) for k in self.letters] + [ord(" ")]) + 1
+        self.char_index = np.full(size, -2, dtype=np.int64)
+        self.char_index[ord(" ")] = self.SPACE
+        for i, letter in enumerate(self.letters):
+            if self.counts[i]:
+                self.char_index[ord(letter)] = i
+
+        # Dense inverse: number -> letter; if a number maps to multiple letters,
+        # the last one will be used
+        top = int(self.homophones.max(initial=-1))
+        self.inverse = np.full(top + 1, "", dtype=object)
+        for letter in self.letters:
+            for n in layout[letter]:
+                self.inverse[n] = letter
+        self._decode = {str(n): ch for n, ch in enumerate(self.inverse) if ch}
+        # Number -> str, with " " appended for spaces
+        self._encode = np.array([str(n) for n in range(top + 1)] + [" "], dtype=object)
+
+    def encrypt_numbers(self, message):
+        """Return the numbers for the message (-1 for spaces)."""
+        codes = np.frombuffer(message.upper().encode("utf-32-le"), dtype=np.uint32)
+        codes = codes[codes < len(self.char_index)]
+        rows = self.char_index[codes]
+        rows = rows[rows != -2]  # other characters are dropped
+        spaces = rows == self.SPACE
+        letters = rows[~spaces]
+        # One random draw for the whole message picks a homophone per letter
+        picks = (self.rng.random(len(letters)) * self.counts[letters]).astype(np.int64)
+        numbers = np.full(len(rows), -1, dtype=np.int64)
+        numbers[~spaces] = self.homophones[letters, picks]
+        return numbers
+
+    def encrypt(self, message):
+        """Encrypt the message; each letter becomes one of its numbers."""
+        return " ".join(self._encode[self.encrypt_numbers(message)].tolist())
+
+    def decrypt_numbers(self, numbers):
+        """Decrypt an array of numbers; unknown numbers become spaces."""
+        numbers = np.asarray(numbers, dtype=np.int64)
+        known = (numbers >= 0) & (numbers < len(self.inverse))
+        letters = np.full(len(numbers), " ", dtype=object)
+        letters[known] = self.inverse[numbers[known]]
+        letters[letters == ""] = " "
+        return "".join(letters.tolist())
+
+    def decrypt(self, cipher):
+        """Decrypt the cipher; tokens that are not numbers of the layout become spaces."""
+        decode = self._decode.get
+        return "".join([decode(p, " ") for p in cipher.split()])
+
+    def encrypt_stream(self, fileobj_in, fileobj_out, chunk_size=1 << 20):
+        """Encrypt a text stream chunk by chunk with the same output as encrypt()."""
+        first = True
+        while True:
+            chunk = fileobj_in.read(chunk_size)
+            if not chunk:
+                break
+            encrypted = self.encrypt(chunk)
+            if encrypted:
+                fileobj_out.write(encrypted if first else " " + encrypted)
+                first = False
+
+    def decrypt_stream(self, fileobj_in, fileobj_out, chunk_size=1 << 20):
+        """Decrypt a text stream chunk by chunk with the same output as decrypt()."""
+        pending = ""
+        while True:
+            chunk = fileobj_in.read(chunk_size)
+            if not chunk:
+                break
+            pending += chunk
+            # Keep the last token, it may continue in the next chunk
+            cut = max(pending.rfind(" "), pending.rfind("\n"))
+            if cut >= 0:
+                fileobj_out.write(self.decrypt(pending[:cut]))
+                pending = pending[cut:]
+        fileobj_out.write(self.decrypt(pending))
+
+
 def encrypt(message, layout):
-    """Encrypt the message using the provided layout."""
-    message = message.upper()
+    """Encrypt the message using the provided layout.
+    Builds nothing, so it suits single calls; to encrypt many messages or
+    long texts with one layout, use HomophonicCipher(layout)."""
     cipher = []
-    for ch in message:
+    for ch in message.upper():
         if ch in layout:
             # Randomly choose one of the possible numbers for the letter
             cipher.append(str(random.choice(layout[ch])))
         elif ch == " ":
             cipher.append(" ")
-        else:
-            continue
     return " ".join(cipher)
 
 
 def decrypt(cipher, layout):
-    """Decrypt the cipher using the provided layout."""
-    # Create inverse mapping
+    """Decrypt the cipher using the provided layout.
+    The inverse mapping is rebuilt on every call; to decrypt many messages
+    with one layout, use HomophonicCipher(layout)."""
     inverse = {}
     for letter, nums in layout.items():
         for n in nums:
             # If a number maps to multiple letters, the last one will be used
             inverse[str(n)] = letter
-
-    parts = cipher.split()
-    text = ""
-    for p in parts:
-        if p in inverse:
-            text += inverse[p]
-        else:
-            text += " "
-    return text
+    return "".join([inverse.get(p, " ") for p in cipher.split()])
 
 
 def main():
@@ -0,0 +1,115 @@
+"""
+Author: jpastor
+Date: 2026-10-17
+Cold-start import time of every cipher module.
+Each module is imported in a fresh interpreter, so caches from earlier
+imports do not hide the cost. For each one it reports the import time, which
+heavy libraries were actually executed (a lazy module that was never touched
+does not count) and whether the import printed anything.
+
+    python import_benchmark.py            # table
+    python import_benchmark.py --json     # JSON, e.g. to compare two commits
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+MODULES = [
+    "caesar",
+    "vigenere",
+    "playfair",
+    "hill",
+    "hill_cipher",
+    "hill_attack",
+    "modular",
+    "prueba",
+    "homophonic",
+    "turning_grille",
+    "turning_grille_parallel",
+    "grille_tools",
+    "otp",
+    "cryptanalysis",
+    "ciphers",
+    "des_backends",
+    "des_cipher",
+    "des_container",
+    "des_parallel",
+]
+HEAVY = ["numpy", "sympy", "pyDes", "Crypto"]
+
+# Runs inside the child interpreter; prints one JSON line on stderr
+_PROBE = """
+import io, json, sys, time
+sys.path[:0] = {paths!r}
+captured, sys.stdout = sys.stdout, io.StringIO()
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+printed, sys.stdout = sys.stdout.getvalue(), captured
+loaded = [
+    name for name in {heavy!r}
+    if name in sys.modules and type(sys.modules[name]).__name__ != "_LazyModule"
+]
+sys.stderr.write(json.dumps({{"ms": elapsed * 1000, "loaded": loaded,
+                             "printed": len(printed)}}) + "\\n")
+"""
+
+
+# ---------- PRIVATE METHODS ----------
+def _probe(module: str) -> dict:
+    # DES modules import their siblings by plain name
+    paths = [HERE, os.path.join(HERE, "DES")]
+    code = _PROBE.format(paths=paths, module=module, heavy=HEAVY)
+    proc = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, cwd=HERE
+    )
+    if proc.returncode != 0:
+        error = proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "failed"
+        return {"error": error}
+    return json.loads(proc.stderr.strip().splitlines()[-1])
+
+
+# ---------- PUBLIC METHODS ----------
+def measure(modules=MODULES, repeat: int = 5) -> dict[str, dict]:
+    """Median cold import time (ms) per module, over `repeat` fresh processes."""
+    results = {}
+    for module in modules:
+        runs = [_probe(module) for _ in range(repeat)]
+        if "error" in runs[0]:
+            results[module] = runs[0]
+            continue
+        results[module] = {
+            "ms": statistics.median(run["ms"] for run in runs),
+            "loaded": runs[0]["loaded"],
+            "printed": runs[0]["printed"],
+        }
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Cold-start import times")
+    parser.add_argument("modules", nargs="*", default=MODULES)
+    parser.add_argument("--repeat", type=int, default=5, help="processes per module")
+    parser.add_argument("--json", action="store_true", help="print JSON")
+    args = parser.parse_args(argv)
+
+    results = measure(args.modules, args.repeat)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{'module':<20} {'ms':>8}  {'printed':>7}  heavy libraries loaded")
+    for module, result in results.items():
+        if "error" in result:
+            print(f"{module:<20} {'-':>8}  {'-':>7}  {result['error']}")
+            continue
+        loaded = ", ".join(result["loaded"]) or "-"
+        print(f"{module:<20} {result['ms']:8.2f}  {result['printed']:>7}  {loaded}")
+
+
+if __name__ == "__main__":
+    main()
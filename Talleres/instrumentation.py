@@ -0,0 +1,331 @@
+"""
+Author: jpastor
+Date: 2026-10-17
+Optional instrumentation for the cipher modules.
+enable() wraps the functions listed in TARGETS (key setup, entry points and
+per-block work) and the file reads and writes of DES/des_cipher.py, and
+sends every call to a sink as (name, phase, seconds, bytes). disable() puts
+the original functions back, so when it is off nothing is wrapped and the
+cost is zero.
+
+    import instrumentation
+    sink = instrumentation.enable(instrumentation.PrometheusSink())
+    ...  # use the ciphers as usual
+    print(sink.render())
+    instrumentation.disable()
+
+Only calls made through the module or class attribute are seen: a name taken
+with `from module import function` before enable() keeps the original, and
+worker processes of a process pool are not instrumented. The DES modules are
+patched under their plain names (des_backends, ...), the way they import each
+other; importing them as DES.des_backends would load a second, unpatched copy.
+"""
+
+import bisect
+import builtins
+import functools
+import importlib
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# (module, attribute path, phase)
+TARGETS = [
+    # Key setup
+    ("vigenere", "VigenereCipher.__init__", "setup"),
+    ("playfair", "generate_key_matrix", "setup"),
+    ("playfair", "PlayfairCipher.__init__", "setup"),
+    ("hill", "det_mod_m", "setup"),
+    ("hill", "inverse_key", "setup"),
+    ("hill_cipher", "det_mod_m", "setup"),
+    ("hill_cipher", "inverse_key", "setup"),
+    ("modular", "matrix_mod_inverse", "setup"),  # inverse_key cache misses
+    ("hill_cipher", "HillCipher.__init__", "setup"),
+    ("homophonic", "gen_layout", "setup"),
+    ("homophonic", "HomophonicCipher.__init__", "setup"),
+    ("turning_grille", "create_grille", "setup"),
+    ("turning_grille", "TurningGrille.__init__", "setup"),
+    # Entry points
+    ("caesar", "caesar_encrypt", "call"),
+    ("caesar", "caesar_decrypt", "call"),
+    ("vigenere", "vigenere_encrypt", "call"),
+    ("vigenere", "vigenere_decrypt", "call"),
+    ("playfair", "playfair", "call"),
+    ("hill", "hill_cipher_encrypt", "call"),
+    ("hill", "hill_cipher_decrypt", "call"),
+    ("hill_cipher", "HillCipher.encrypt", "call"),
+    ("hill_cipher", "HillCipher.decrypt", "call"),
+    ("homophonic", "encrypt", "call"),
+    ("homophonic", "decrypt", "call"),
+    ("turning_grille", "turning_grille", "call"),
+    ("otp", "otpEncrypt", "call"),
+    ("otp", "otpDecrypt", "call"),
+    ("des_cipher", "image_cipher_des", "call"),
+    ("des_cipher", "image_decipher_des", "call"),
+    ("des_cipher", "encrypt_file_des", "call"),
+    ("des_cipher", "decrypt_file_des", "call"),
+    # Per-block work
+    ("caesar", "CaesarCipher.encrypt", "block"),
+    ("caesar", "CaesarCipher.decrypt", "block"),
+    ("vigenere", "VigenereCipher._apply", "block"),
+    ("playfair", "PlayfairCipher._translate", "block"),
+    ("hill_cipher", "HillCipher._multiply", "block"),
+    ("homophonic", "HomophonicCipher.encrypt_numbers", "block"),
+    ("homophonic", "HomophonicCipher.decrypt", "block"),
+    ("turning_grille", "TurningGrille._gather", "block"),
+] + [
+    ("des_backends", f"{backend}.{method}", "block")
+    for backend in ("NumpyBackend", "CryptodomeBackend", "PyDesBackend")
+    for method in ("encrypt_ecb", "decrypt_ecb", "encrypt_cbc", "decrypt_cbc")
+]
+
+# Modules whose file reads and writes are recorded (phase "io")
+IO_MODULES = ["des_cipher"]
+
+# Upper bounds (seconds) of the histogram buckets
+BUCKETS = (1e-6, 1e-5, 1e-4, 1e-3, 0.01, 0.1, 1.0, 10.0)
+
+
+# ---------- SINKS ----------
+class HistogramSink:
+    """Keep a count, a total time, a byte count and a latency histogram per
+    (name, phase) in memory."""
+
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = tuple(buckets)
+        self.series = {}
+        self._lock = threading.Lock()
+
+    def record(self, name: str, phase: str, seconds: float, nbytes: int = 0) -> None:
+        with self._lock:
+            entry = self.series.get((name, phase))
+            if entry is None:
+                entry = self.series[(name, phase)] = {
+                    "count": 0,
+                    "seconds": 0.0,
+                    "bytes": 0,
+                    "buckets": [0] * (len(self.buckets) + 1),  # last one is +Inf
+                }
+            entry["count"] += 1
+            entry["seconds"] += seconds
+            entry["bytes"] += nbytes
+            entry["buckets"][bisect.bisect_left(self.buckets, seconds)] += 1
+
+    def reset(self) -> None:
+        with self._lock:
+            self.series.clear()
+
+    def snapshot(self) -> dict:
+        """Copy of the data as {"name:phase": {...}}, e.g. for JSON."""
+        with self._lock:
+            return {
+                f"{name}:{phase}": {**entry, "buckets": list(entry["buckets"])}
+                for (name, phase), entry in sorted(self.series.items())
+            }
+
+    def summary(self) -> str:
+        """Plain text table: calls, total and mean time per function."""
+        lines = [f"{'function':<40} {'phase':<6} {'calls':>8} {'total ms':>11} {'mean us':>10}"]
+        for key, entry in self.snapshot().items():
+            name, phase = key.rsplit(":", 1)
+            mean = entry["seconds"] / entry["count"] * 1e6
+            lines.append(
+                f"{name:<40} {phase:<6} {entry['count']:>8} "
+                f"{entry['seconds'] * 1000:11.3f} {mean:10.1f}"
+            )
+        return "\n".join(lines)
+
+
+class PrometheusSink(HistogramSink):
+    """Histogram sink that renders the Prometheus text exposition format."""
+
+    prefix = "talleres_cipher"
+
+    def render(self) -> str:
+        p = self.prefix
+        lines = [
+            f"# HELP {p}_seconds Time spent per function call.",
+            f"# TYPE {p}_seconds histogram",
+        ]
+        totals = []
+        for key, entry in self.snapshot().items():
+            name, phase = key.rsplit(":", 1)
+            labels = f'function="{name}",phase="{phase}"'
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), entry["buckets"]):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f'{p}_seconds_bucket{{{labels},le="{le}"}} {cumulative}')
+            lines.append(f"{p}_seconds_sum{{{labels}}} {entry['seconds']!r}")
+            lines.append(f"{p}_seconds_count{{{labels}}} {entry['count']}")
+            totals.append(f"{p}_bytes_total{{{labels}}} {entry['bytes']}")
+        lines += [
+            f"# HELP {p}_bytes_total Bytes of text or file data processed.",
+            f"# TYPE {p}_bytes_total counter",
+        ] + totals
+        return "\n".join(lines) + "\n"
+
+
+# ---------- PRIVATE METHODS ----------
+_sink = None
+_patches = []  # (owner, attribute, original) to undo on disable()
+_MISSING = object()  # the attribute was inherited, not set on the owner
+_lock = threading.Lock()
+
+
+def _size(args) -> int:
+    """Length of the first text or bytes argument (0 if there is none)."""
+    for arg in args:
+        if isinstance(arg, (str, bytes, bytearray, memoryview)):
+            return len(arg)
+    return 0
+
+
+def _wrap(func, name: str, phase: str):
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            sink = _sink
+            if sink is not None:
+                sink.record(name, phase, time.perf_counter() - start, _size(args))
+
+    return wrapper
+
+
+class _TimedFile:
+    """File proxy that records the time and size of every read and write."""
+
+    def __init__(self, f, name: str):
+        self._f = f
+        self._name = name
+
+    def _timed(self, op, method, *args):
+        start = time.perf_counter()
+        result = method(*args)
+        sink = _sink
+        if sink is not None:
+            nbytes = result if op == "write" else len(result)
+            sink.record(f"{self._name}.{op}", "io", time.perf_counter() - start, nbytes)
+        return result
+
+    def read(self, *args):
+        return self._timed("read", self._f.read, *args)
+
+    def write(self, data):
+        return self._timed("write", self._f.write, data)
+
+    def __iter__(self):
+        return iter(self._f)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return self._f.__exit__(*exc)
+
+    def __getattr__(self, attr):
+        return getattr(self._f, attr)
+
+
+def _timed_open(module_name: str):
+    def open_(*args, **kwargs):
+        return _TimedFile(builtins.open(*args, **kwargs), module_name)
+
+    return open_
+
+
+def _import(module_name: str):
+    # The DES modules import each other by plain name, as when run from DES/
+    des_dir = os.path.join(HERE, "DES")
+    if module_name.startswith("des_") and des_dir not in sys.path:
+        sys.path.insert(0, des_dir)
+    return importlib.import_module(module_name)
+
+
+def _patch(owner, attr: str, value) -> None:
+    _patches.append((owner, attr, owner.__dict__.get(attr, _MISSING)))
+    setattr(owner, attr, value)
+
+
+def _unpatch() -> None:
+    while _patches:
+        owner, attr, original = _patches.pop()
+        if original is _MISSING:
+            delattr(owner, attr)
+        else:
+            setattr(owner, attr, original)
+
+
+# ---------- PUBLIC METHODS ----------
+def enable(sink=None, targets=None):
+    """Start recording into `sink` (a new HistogramSink by default).
+    Modules of the targets are imported if needed. Returns the sink."""
+    global _sink
+    with _lock:
+        if _patches:
+            _unpatch()
+        _sink = sink if sink is not None else HistogramSink()
+        for module_name, path, phase in targets or TARGETS:
+            owner = _import(module_name)
+            *parents, attr = path.split(".")
+            for parent in parents:
+                owner = getattr(owner, parent)
+            _patch(owner, attr, _wrap(getattr(owner, attr), f"{module_name}.{path}", phase))
+        for module_name in IO_MODULES:
+            _patch(_import(module_name), "open", _timed_open(module_name))
+        return _sink
+
+
+def disable() -> None:
+    """Stop recording and restore every original function."""
+    global _sink
+    with _lock:
+        _unpatch()
+        _sink = None
+
+
+def enabled() -> bool:
+    return _sink is not None
+
+
+@contextmanager
+def instrumented(sink=None, targets=None):
+    """Record only inside a with block: `with instrumented() as sink: ...`"""
+    sink = enable(sink, targets)
+    try:
+        yield sink
+    finally:
+        disable()
+
+
+def main():
+    print("=== Instrumentation demo ===")
+    text = "ATTACK AT DAWN " * 200
+    with instrumented(PrometheusSink()) as sink:
+        import caesar
+        import hill_cipher
+        import playfair
+        import turning_grille
+        import vigenere
+
+        caesar.caesar_decrypt(caesar.caesar_encrypt(text, 3), 3)
+        vigenere.vigenere_decrypt(vigenere.vigenere_encrypt(text, "LEMON", 1), "LEMON", 1)
+        playfair.playfair(playfair.playfair(text, "MONARCHY", 1), "MONARCHY", 0)
+        cipher = hill_cipher.HillCipher([[3, 3], [2, 5]])
+        cipher.decrypt(cipher.encrypt(text))
+        holes = [(0, 0), (2, 1), (2, 3), (3, 2)]
+        turning_grille.turning_grille(text, 4, 1, 1, holes)
+    print(sink.summary())
+    print()
+    print(sink.render())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+"""
+Author: jpastor
+Date: 2026-10-17
+Lazy imports for heavy libraries (numpy, sympy, pyDes).
+The module object is created right away but only executed the first time
+one of its attributes is used, so importing a cipher module stays cheap.
+importlib's LazyLoader is not thread-safe on Python 3.11 and older: two
+threads using a lazy module for the first time at once can both run it, or
+see it half loaded. Code that uses the ciphers from several threads should
+call load_all() first.
+"""
+
+import importlib.util
+import sys
+
+
+def lazy_import(name: str):
+    """Return module `name`, deferring its execution until first use."""
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ModuleNotFoundError(f"No module named '{name}'", name=name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+
+def load_all() -> None:
+    """Run now every module created by lazy_import that has not run yet."""
+    for module in list(sys.modules.values()):
+        if type(module).__name__ == "_LazyModule":
+            module.__name__  # any attribute access runs the module
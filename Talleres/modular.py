@@ -0,0 +1,200 @@
+"""
+Author: jpastor
+Date: 2026-10-17
+Modular arithmetic shared by the Hill cipher code.
+- Extended Euclid for one number and vectorized over NumPy arrays.
+- Full inverse tables per modulus, built once and cached.
+- Exact matrix operations modulo m: determinant, inverse (cached per key and
+  modulus), batched triangular inverses and batched solving over a prime
+  field. Everything is integer arithmetic, so there is no rounding.
+"""
+
+from __future__ import annotations
+
+import functools
+from math import gcd
+
+from lazy import lazy_import
+
+np = lazy_import("numpy")  # loaded on first use
+
+TABLE_LIMIT = 1 << 16  # larger moduli use vectorized Euclid instead of a table
+
+
+# ---------- SCALARS ----------
+def egcd(a: int, b: int) -> tuple[int, int, int]:
+    """Return (g, x, y) with a*x + b*y = g = gcd(a, b)."""
+    x0, x1, y0, y1 = 1, 0, 0, 1
+    while b:
+        q, a, b = a // b, b, a % b
+        x0, x1 = x1, x0 - q * x1
+        y0, y1 = y1, y0 - q * y1
+    return a, x0, y0
+
+
+def mod_inverse(a: int, m: int) -> int:
+    """Inverse of a modulo m; raises ValueError if it does not exist."""
+    g, x, _ = egcd(a % m, m)
+    if g != 1:
+        raise ValueError(f"Modular inverse does not exist for {a} mod {m}")
+    return x % m
+
+
+# ---------- ARRAYS ----------
+def _egcd_array(values: np.ndarray, m: int) -> tuple[np.ndarray, np.ndarray]:
+    """Extended Euclid on every element at once.
+    Returns (gcd(values, m), s) with s * values = gcd (mod m)."""
+    r0 = np.full(values.shape, m, dtype=np.int64)
+    r1 = np.asarray(values, dtype=np.int64) % m
+    s0 = np.zeros(values.shape, dtype=np.int64)
+    s1 = np.ones(values.shape, dtype=np.int64)
+    # Invariant: r_i = s_i * value (mod m)
+    while (active := r1 != 0).any():
+        q = np.where(active, r0 // np.where(active, r1, 1), 0)
+        r0, r1 = np.where(active, r1, r0), np.where(active, r0 - q * r1, r1)
+        s0, s1 = np.where(active, s1, s0), np.where(active, s0 - q * s1, s1)
+    return r0, s0 % m
+
+
+@functools.lru_cache(maxsize=64)
+def inverse_table(m: int) -> np.ndarray:
+    """table[a] = inverse of a mod m, or 0 when a has none. Read-only, cached."""
+    if m > TABLE_LIMIT:
+        raise ValueError(f"Inverse tables are only built for moduli up to {TABLE_LIMIT}")
+    g, s = _egcd_array(np.arange(m), m)
+    table = np.where(g == 1, s, 0)
+    table.flags.writeable = False
+    return table
+
+
+@functools.lru_cache(maxsize=64)
+def units(m: int) -> tuple[tuple[int, ...], tuple[int, ...]]:
+    """Numbers with an inverse modulo m, and their inverses."""
+    found = tuple(u for u in range(1, m) if gcd(u, m) == 1)
+    return found, tuple(mod_inverse(u, m) for u in found)
+
+
+def matmul_mod(a, b, m: int) -> np.ndarray:
+    """(a @ b) mod m without overflow for any modulus below 2**31.
+    Uses int32 when a row times a column always fits in it."""
+    n = np.shape(a)[-1]
+    dtype = np.int32 if n * (m - 1) ** 2 < 2**31 else np.int64
+    a = np.asarray(a) % m
+    b = np.asarray(b) % m
+    a = a.astype(dtype, copy=False)
+    b = b.astype(dtype, copy=False)
+    if n * (m - 1) ** 2 < 2**63:
+        return a @ b % m
+    # Split the inner sum so no partial sum can overflow
+    step = max(1, (2**63 - 1) // (m - 1) ** 2)
+    result = np.zeros(a.shape[:-1] + b.shape[-1:], dtype=np.int64)
+    for k in range(0, n, step):
+        result = (result + a[..., k : k + step] @ b[..., k : k + step, :] % m) % m
+    return result
+
+
+# ---------- MATRICES ----------
+def _reduce_column(a: np.ndarray, col: int, m: int, others=None) -> int:
+    """Bring gcd of a[col:, col] to row col with Euclid-style row operations.
+    Works for composite moduli, where a column may hold no invertible entry
+    even though the matrix is invertible. Returns the number of row swaps."""
+    swaps = 0
+    for row in range(col + 1, a.shape[0]):
+        while a[row, col] != 0:
+            q = a[col, col] // a[row, col]
+            a[col] = (a[col] - q * a[row]) % m
+            a[[col, row]] = a[[row, col]]
+            if others is not None:
+                others[col] = (others[col] - q * others[row]) % m
+                others[[col, row]] = others[[row, col]]
+            swaps += 1
+    return swaps
+
+
+def det_mod_m(matrix, m: int = 26) -> int:
+    """Exact determinant of an integer matrix modulo m in O(n^3)."""
+    a = np.array(matrix, dtype=np.int64) % m
+    n = a.shape[0]
+    det = 1
+    for col in range(n):
+        if _reduce_column(a, col, m) % 2:
+            det = -det
+        det = det * int(a[col, col]) % m
+        if det == 0:
+            return 0
+    return det % m
+
+
+def matrix_mod_inverse(matrix, m: int = 26) -> np.ndarray:
+    """Invert an integer matrix modulo m with exact Gauss-Jordan elimination."""
+    a = np.array(matrix, dtype=np.int64) % m
+    n = a.shape[0]
+    inv = np.eye(n, dtype=np.int64)
+    for col in range(n):
+        _reduce_column(a, col, m, inv)
+        pivot = int(a[col, col])
+        if gcd(pivot, m) != 1:
+            raise ValueError(f"Key matrix is not invertible modulo {m}")
+        # Scale the pivot row so the pivot becomes 1
+        factor = mod_inverse(pivot, m)
+        a[col] = a[col] * factor % m
+        inv[col] = inv[col] * factor % m
+        # Clear the column in every other row at once
+        f = a[:, col].copy()
+        f[col] = 0
+        a = (a - f[:, None] * a[col]) % m
+        inv = (inv - f[:, None] * inv[col]) % m
+    return inv
+
+
+@functools.lru_cache(maxsize=256)
+def _cached_inverse(key_bytes: bytes, n: int, m: int) -> np.ndarray:
+    key = np.frombuffer(key_bytes, dtype=np.int64).reshape(n, n)
+    inv = matrix_mod_inverse(key, m)
+    inv.flags.writeable = False  # shared between callers
+    return inv
+
+
+def inverse_key(key, m: int = 26) -> np.ndarray:
+    """Inverse of the key modulo m, computed once per (key, m) and kept in an LRU cache."""
+    key = np.ascontiguousarray(key, dtype=np.int64) % m
+    return _cached_inverse(key.tobytes(), key.shape[0], m)
+
+
+def unit_lower_inverse(lower: np.ndarray, m: int) -> np.ndarray:
+    """Invert a batch of unit lower triangular matrices mod m (forward substitution)."""
+    count, n, _ = lower.shape
+    inv = np.zeros_like(lower)
+    for i in range(n):
+        inv[:, i, i] = 1
+        if i:
+            # row i of L^-1 = e_i - sum_k L[i, k] * row k of L^-1
+            inv[:, i, :] = (
+                inv[:, i, :] - np.einsum("bk,bkj->bj", lower[:, i, :i], inv[:, :i, :])
+            ) % m
+    return inv
+
+
+def solve_mod_prime(a: np.ndarray, b: np.ndarray, p: int):
+    """Solve a[i] @ x[i] = b[i] mod prime p for a batch of square systems
+    with Gauss-Jordan elimination vectorized over the batch.
+    Returns (x, ok) where ok marks the systems whose matrix is invertible."""
+    count, n, _ = a.shape
+    aug = np.concatenate([a, b], axis=2) % p
+    inverses = inverse_table(p)
+    ok = np.ones(count, dtype=bool)
+    batch = np.arange(count)
+    for col in range(n):
+        # First row at or below col with a nonzero entry in this column
+        nonzero = aug[:, col:, col] != 0
+        ok &= nonzero.any(axis=1)
+        pivot = col + nonzero.argmax(axis=1)
+        rows = aug[batch, pivot].copy()
+        aug[batch, pivot] = aug[:, col]
+        rows = rows * inverses[rows[:, col]][:, None] % p
+        aug[:, col] = rows
+        # Clear the column in every other row at once
+        factors = aug[:, :, col].copy()
+        factors[:, col] = 0
+        aug = (aug - factors[:, :, None] * rows[:, None, :]) % p
+    return aug[:, :, n:], ok
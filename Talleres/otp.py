@@ -4,13 +4,64 @@ Date: 2025-09-06
 One-Time Pad (OTP) Encryption and Decryption Example
 """
 
+import contextlib
+import os
 import secrets
 import string
 
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+CHUNK_SIZE = 1 << 20  # 1 MiB per read when working with files
+
+ALPHABET = string.ascii_letters + string.digits + string.punctuation + " "
+
+# Random bytes below _LIMIT map uniformly onto the alphabet with b % len(ALPHABET);
+# the rest are rejected so no character is more likely than another
+_LIMIT = 256 - 256 % len(ALPHABET)
+_TEXT_TABLE = bytes(ord(ALPHABET[b % len(ALPHABET)]) for b in range(_LIMIT)) + bytes(
+    256 - _LIMIT
+)
+_REJECTED = bytes(range(_LIMIT, 256))
+
+
+def _randomTextBlock(length):
+    # Map and reject a whole block of random bytes at once
+    out = bytearray()
+    while len(out) < length:
+        missing = length - len(out)
+        # Ask for a bit more than needed to make up for rejected bytes
+        block = secrets.token_bytes(missing * 256 // _LIMIT + 16)
+        out += block.translate(_TEXT_TABLE, _REJECTED)
+    return bytes(out[:length])
+
+
+def generatePad(length, mode="text"):
+    """Generate a pad of `length` bytes.
+    mode="text" draws characters from ALPHABET, mode="bytes" returns raw random bytes."""
+    if mode == "bytes":
+        return secrets.token_bytes(length)
+    if mode == "text":
+        return _randomTextBlock(length)
+    raise ValueError("Mode must be 'text' or 'bytes'")
+
+
+def writePadFile(path, length, mode="text", chunk_size=CHUNK_SIZE):
+    """Write a new pad of `length` bytes straight to disk, one chunk at a time."""
+    with open(path, "wb") as f:
+        written = 0
+        while written < length:
+            n = min(chunk_size, length - written)
+            f.write(generatePad(n, mode))
+            written += n
+    return path
+
 
 def generateRandomKey(length):
-    alphabet = string.ascii_letters + string.digits + string.punctuation + " "
-    return "".join(secrets.choice(alphabet) for _ in range(length))
+    return generatePad(length, "text").decode("ascii")
 
 
 def otpEncrypt(txt, key):
@@ -27,7 +78,7 @@ def otpEncrypt(txt, key):
         raise ValueError("Text and key must be of the same length")
 
     # XOR each byte in the text with the corresponding byte in the key
-    ciphertxt = bytes([txt_bytes[i] ^ key_bytes[i] for i in range(len(txt_bytes))])
+    ciphertxt = _xorBytes(txt_bytes, key_bytes)
     return ciphertxt
 
 
@@ -44,10 +95,127 @@ def otpDecrypt(ciphertxt, key):
         raise ValueError("Ciphertext and key must be of the same length")
 
     # XOR each byte in the ciphertext with the corresponding byte in the key.
-    txt_bytes = bytes([ciphertxt[i] ^ key_bytes[i] for i in range(len(ciphertxt))])
+    txt_bytes = _xorBytes(ciphertxt, key_bytes)
     return txt_bytes.decode("utf-8")
 
 
+def _xorBytes(data, pad):
+    # XOR the whole block as one big integer instead of byte by byte
+    n = len(data)
+    mixed = int.from_bytes(data, "little") ^ int.from_bytes(pad[:n], "little")
+    return mixed.to_bytes(n, "little")
+
+
+def otpXorStream(src, dst, pad, chunk_size=CHUNK_SIZE):
+    """XOR a binary stream with a pad stream, writing the result incrementally.
+    Works with files, sockets (sock.makefile("rb")) or any object with read().
+    Returns the number of bytes processed."""
+    total = 0
+    while True:
+        chunk = src.read(chunk_size)
+        if not chunk:
+            break
+        pad_chunk = pad.read(len(chunk))
+        if len(pad_chunk) != len(chunk):
+            raise ValueError("Pad is shorter than the data")
+        dst.write(_xorBytes(chunk, pad_chunk))
+        total += len(chunk)
+    return total
+
+
+@contextlib.contextmanager
+def _exclusive_lock(path):
+    """Hold an exclusive lock on `path` (created if needed) across processes."""
+    with open(path, "a+b") as f:
+        if fcntl:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class PadFile:
+    """A pad file whose used bytes are tracked in a sidecar '<pad>.offset' file,
+    so every message gets a fresh range of the pad."""
+
+    def __init__(self, path):
+        self.path = path
+        self.offset_path = path + ".offset"
+        # The offset file is replaced on every write, so the lock lives apart
+        self.lock_path = self.offset_path + ".lock"
+        self.size = os.path.getsize(path)
+
+    @property
+    def offset(self):
+        if not os.path.exists(self.offset_path):
+            return 0
+        with open(self.offset_path) as f:
+            return int(f.read().strip() or 0)
+
+    @property
+    def remaining(self):
+        return self.size - self.offset
+
+    def reserve(self, length):
+        """Mark `length` bytes as used and return where they start.
+        The new offset is saved before any encryption happens, so a crash
+        can never cause the same pad bytes to be used twice, and the
+        read-modify-write holds an exclusive lock, so two processes can
+        never reserve the same range."""
+        with _exclusive_lock(self.lock_path):
+            start = self.offset
+            if start + length > self.size:
+                raise ValueError(
+                    f"Not enough pad left: need {length} bytes, {self.size - start} remain"
+                )
+            tmp_path = self.offset_path + ".tmp"
+            with open(tmp_path, "w") as f:
+                f.write(str(start + length))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.offset_path)
+        return start
+
+    def open_at(self, offset):
+        """Open the pad for reading at a given offset."""
+        f = open(self.path, "rb")
+        f.seek(offset)
+        return f
+
+
+def otpEncryptFile(input_path, output_path, pad, chunk_size=CHUNK_SIZE):
+    """Encrypt a file with the next unused bytes of a pad file.
+    Returns the pad offset, which is needed to decrypt."""
+    if not isinstance(pad, PadFile):
+        pad = PadFile(pad)
+
+    offset = pad.reserve(os.path.getsize(input_path))
+    with open(input_path, "rb") as src, open(output_path, "wb") as dst:
+        with pad.open_at(offset) as pad_stream:
+            otpXorStream(src, dst, pad_stream, chunk_size)
+    return offset
+
+
+def otpDecryptFile(input_path, output_path, pad, offset, chunk_size=CHUNK_SIZE):
+    """Decrypt a file produced by otpEncryptFile using the same pad and offset."""
+    if not isinstance(pad, PadFile):
+        pad = PadFile(pad)
+
+    if offset + os.path.getsize(input_path) > pad.size:
+        raise ValueError("Ciphertext is longer than the pad at this offset")
+    with open(input_path, "rb") as src, open(output_path, "wb") as dst:
+        with pad.open_at(offset) as pad_stream:
+            otpXorStream(src, dst, pad_stream, chunk_size)
+
+
 if __name__ == "__main__":
     plaintext = input("Enter the plaintext message: ")
 
@@ -3,6 +3,7 @@ Author: jpastor
 Date: 2025-09-06
 Playfair Cipher Encryption and Decryption Example"""
 
+import functools
 import string
 
 
@@ -35,18 +36,19 @@ def format_text(text, for_encrypt=True):
 
     if for_encrypt:
         i = 0
-        formatted = ""
+        formatted = []
         while i < len(text):
             a = text[i]
             b = text[i + 1] if i + 1 < len(text) else "X"
 
             if a == b:
-                formatted += a + "X"
+                formatted.append(a + "X")
                 i += 1
             else:
-                formatted += a + b
+                formatted.append(a + b)
                 i += 2
 
+        formatted = "".join(formatted)
         if len(formatted) % 2 != 0:
             formatted += "X"
         return formatted
@@ -64,6 +66,60 @@ def find_position(matrix, char):
     return None
 
 
+class PlayfairCipher:
+    def __init__(self, key):
+        """Build the key matrix and every digraph substitution once."""
+        if not key:
+            raise ValueError("Key cannot be empty")
+        self.matrix = generate_key_matrix(key)
+        # letter -> (row, col), so no scanning of the matrix is needed
+        self.positions = {
+            ch: (i, j) for i, row in enumerate(self.matrix) for j, ch in enumerate(row)
+        }
+        self.encrypt_table = self._build_table(1)
+        self.decrypt_table = self._build_table(-1)
+
+    def _substitute(self, a, b, step):
+        row1, col1 = self.positions[a]
+        row2, col2 = self.positions[b]
+        m = self.matrix
+        if row1 == row2:
+            # Same row
+            return m[row1][(col1 + step) % 5] + m[row2][(col2 + step) % 5]
+        if col1 == col2:
+            # Same column
+            return m[(row1 + step) % 5][col1] + m[(row2 + step) % 5][col2]
+        # Rectangle
+        return m[row1][col2] + m[row2][col1]
+
+    def _build_table(self, step):
+        # All 25x25 digraphs, including repeated letters such as "XX"
+        return {
+            a + b: self._substitute(a, b, step)
+            for a in self.positions
+            for b in self.positions
+        }
+
+    def _translate(self, text, table):
+        return "".join([table[text[i : i + 2]] for i in range(0, len(text), 2)])
+
+    def encrypt(self, text):
+        return self._translate(format_text(text, for_encrypt=True), self.encrypt_table)
+
+    def decrypt(self, text, strip_padding=True):
+        result = self._translate(format_text(text, for_encrypt=False), self.decrypt_table)
+        # Remove X at the end if it's padding
+        if strip_padding and result.endswith("X"):
+            result = result[:-1]
+        return result
+
+
+@functools.lru_cache(maxsize=128)
+def get_cipher(key):
+    """Return a PlayfairCipher for key, reusing the one built on a previous call."""
+    return PlayfairCipher(key)
+
+
 def playfair(text, key, mode=1):
     """
     mode=1 → encrypt
@@ -72,53 +128,11 @@ def playfair(text, key, mode=1):
     if not text or not key:
         raise ValueError("Text and key cannot be empty")
 
-    matrix = generate_key_matrix(key)
-    text = format_text(text, for_encrypt=(mode == 1))
-    result = ""
-
-    for i in range(0, len(text), 2):
-        a, b = text[i], text[i + 1]
-        pos_a = find_position(matrix, a)
-        pos_b = find_position(matrix, b)
-
-        if pos_a is None or pos_b is None:
-            raise ValueError(
-                f"Character not found in matrix: {a if pos_a is None else b}"
-            )
-
-        row1, col1 = pos_a
-        row2, col2 = pos_b
-
-        if row1 == row2:
-            # Same row
-            if mode == 1:
-                result += matrix[row1][(col1 + 1) % 5]
-                result += matrix[row2][(col2 + 1) % 5]
-            else:
-                result += matrix[row1][(col1 - 1) % 5]
-                result += matrix[row2][(col2 - 1) % 5]
-
-        elif col1 == col2:
-            # Same column
-            if mode == 1:
-                result += matrix[(row1 + 1) % 5][col1]
-                result += matrix[(row2 + 1) % 5][col2]
-            else:
-                result += matrix[(row1 - 1) % 5][col1]
-                result += matrix[(row2 - 1) % 5][col2]
-
-        else:
-            # Rectangle
-            result += matrix[row1][col2]
-            result += matrix[row2][col1]
-
-    # Basic cleanup for decryption
-    if mode == 0:
-        # Remove X at the end if it's padding
-        if result.endswith("X"):
-            result = result[:-1]
-
-    return result
+    cipher = get_cipher(key)
+    if mode == 1:
+        return cipher.encrypt(text)
+    # Basic cleanup for decryption only with mode=0
+    return cipher.decrypt(text, strip_padding=(mode == 0))
 
 
 if __name__ == "__main__":
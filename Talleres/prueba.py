@@ -1,23 +1,23 @@
-import numpy as np
+from __future__ import annotations
+
 from math import gcd
-from sympy import Matrix  # más preciso para determinantes enteros
+
+from hill_cipher import HillCipher
+from lazy import lazy_import
+
+np = lazy_import("numpy")
 
 
 def generate_key(n: int) -> np.ndarray:
     """Generate a random invertible key matrix of size n x n (mod 26)."""
-    while True:
-        key = np.random.randint(0, 26, size=(n, n))  # matriz aleatoria
-        det = int(Matrix(key).det())
-        det_mod = det % 26
-        if det_mod != 0 and gcd(det_mod, 26) == 1:
-            return key
+    key, _ = HillCipher.generate_key(n)  # sin determinantes de sympy
+    return key
 
-# ejemplo con 5x5
-key = generate_key(5)
-print("Generated key 5x5:\n", key)
 
 def validate_key(key: list[list[int]]) -> np.ndarray:
     """Validate that the key is a square matrix and invertible modulo 26."""
+    from sympy import Matrix  # más preciso para determinantes enteros
+
     key = np.array(key)
     det = int(Matrix(key).det())  # determinante exacto
     det_mod = det % 26
@@ -25,4 +25,9 @@ def validate_key(key: list[list[int]]) -> np.ndarray:
         raise ValueError("Key matrix is not invertible modulo 26")
     return key
 
-validate_key(key)  # debería pasar sin errores
+
+if __name__ == "__main__":
+    # ejemplo con 5x5
+    key = generate_key(5)
+    print("Generated key 5x5:\n", key)
+    validate_key(key)  # debería pasar sin errores
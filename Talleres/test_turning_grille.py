@@ -0,0 +1,64 @@
+"""
+Author: jpastor
+Date: 2026-10-17
+Round trips of the turning grille with valid grilles of every size.
+    python -m pytest test_turning_grille.py
+"""
+
+import random
+
+import pytest
+
+from grille_tools import is_valid_grille, random_grille
+from turning_grille import create_grille, decrypt_block, encrypt_block, turning_grille
+
+LETTERS = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+
+
+@pytest.mark.parametrize("size", [2, 3, 4, 5, 6, 7])
+@pytest.mark.parametrize("direction", [0, 1])
+def test_round_trip(size, direction):
+    rng = random.Random(size)
+    for seed in range(10):
+        holes = random_grille(size, seed)
+        assert is_valid_grille(size, holes)
+        for length in (1, size * size - 1, size * size, 100):
+            message = "".join(rng.choice(LETTERS) for _ in range(length))
+            encrypted = turning_grille(message, size, direction, 1, holes)
+            decrypted = turning_grille(encrypted, size, direction, 0, holes)
+            assert len(encrypted) >= length
+            assert decrypted[:length] == message
+            assert set(decrypted[length:]) <= {"X"}
+
+
+def test_odd_grille_skips_center():
+    holes = random_grille(5, seed=1)
+    message = LETTERS[:24]
+    encrypted = turning_grille(message, 5, 1, 1, holes)
+    assert len(encrypted) == 24
+    assert sorted(encrypted) == sorted(message)
+    assert turning_grille(encrypted, 5, 1, 0, holes) == message
+
+
+@pytest.mark.parametrize(
+    "size, holes",
+    [
+        (4, [(0, 0)]),
+        (4, [(0, 0), (0, 1)]),
+        (4, [(0, 0), (0, 3), (1, 1)]),
+        (4, [(0, 0), (2, 1), (2, 3), (3, 2)]),
+        (5, [(0, 0), (0, 1), (2, 2)]),
+    ],
+)
+@pytest.mark.parametrize("direction", [0, 1])
+def test_matches_block_functions(size, holes, direction):
+    """Invalid and even grilles give the same output as encrypt_block/decrypt_block."""
+    message = "JIMATTACKSATDAWNHELLOWORLD"
+    grille = create_grille(size, holes)
+    total = size * size
+    padded = message + "X" * (-len(message) % total)
+    blocks = [padded[i : i + total] for i in range(0, len(padded), total)]
+    expected = "".join(encrypt_block(b, grille, size, direction) for b in blocks)
+    assert turning_grille(message, size, direction, 1, holes) == expected
+    expected = "".join(decrypt_block(b, grille, size, direction) for b in blocks)
+    assert turning_grille(message, size, direction, 0, holes) == expected
@@ -1,4 +1,7 @@
-import numpy as np
+from grille_tools import grille_errors, is_valid_grille
+from lazy import lazy_import
+
+np = lazy_import("numpy")  # loaded on first use
 
 
 def rotate_grille(grille, direction=1):
@@ -39,25 +42,71 @@ def decrypt_block(block, grille, size, direction):
     return text
 
 
-def turning_grille(message, size, direction, mode, holes):
-    message = message.replace(" ", "").upper()
-    grille = create_grille(size, holes)
-    total = size * size
-    result = ""
+class TurningGrille:
+    def __init__(self, size, holes, direction=1):
+        """Compute the block permutation for a grille once.
+        Every block of a message is then permuted with one gather; `total` is
+        the number of letters per block."""
+        self.size = size
+        self.direction = direction
+        self.total = size * size
+        grille = create_grille(size, holes)
+
+        # Cells under a hole for each of the 4 rotations, in reading order
+        visits = []
+        g = grille.copy()
+        for _ in range(4):
+            visits.extend(np.flatnonzero(g.ravel() == 1))
+            g = rotate_grille(g, direction)
+        visits = np.array(visits, dtype=np.intp)
+
+        if size % 2 and is_valid_grille(size, holes):
+            # A valid odd grille never visits the center: blocks hold one
+            # letter per visited cell (size^2 - 1), read back in reading
+            # order with the center skipped
+            self.total = len(visits)
+            position = np.full(size * size, -1, dtype=np.intp)
+            position[np.sort(visits)] = np.arange(self.total)
+            self.decrypt_index = position[visits]
+            self.encrypt_index = np.argsort(visits)
+            return
+
+        # Any other grille keeps the behaviour of encrypt_block: it writes block[idx]
+        # into the idx-th visited cell (while idx < block length); a cell
+        # visited twice keeps the last letter and a cell never visited stays
+        # empty
+        self.decrypt_index = visits
+        last = np.full(self.total, -1, dtype=np.intp)
+        for idx, cell in enumerate(self.decrypt_index[: self.total]):
+            last[cell] = idx
+        self.encrypt_index = last[last >= 0]
+
+    def _blocks(self, message):
+        """Pad the message with X and return it as a (blocks x total) array."""
+        padding = -len(message) % self.total
+        message += "X" * padding
+        codes = np.frombuffer(message.encode("utf-32-le"), dtype=np.uint32)
+        return codes.reshape(-1, self.total)
+
+    def _gather(self, message, index):
+        if not message:
+            return ""
+        out = self._blocks(message)[:, index]
+        return out.tobytes().decode("utf-32-le")
+
+    def encrypt(self, message):
+        return self._gather(message.replace(" ", "").upper(), self.encrypt_index)
+
+    def decrypt(self, message):
+        return self._gather(message.replace(" ", "").upper(), self.decrypt_index)
 
+
+def turning_grille(message, size, direction, mode, holes):
+    grille = TurningGrille(size, holes, direction)
     if mode == 1:  # Encrypt
-        while len(message) % total != 0:
-            message += "X"
-        blocks = [message[i : i + total] for i in range(0, len(message), total)]
-        for b in blocks:
-            result += encrypt_block(b, grille, size, direction)
+        return grille.encrypt(message)
     else:  # Decrypt
-        while len(message) % total != 0:
-            message += "X"
-        blocks = [message[i : i + total] for i in range(0, len(message), total)]
-        for b in blocks:
-            result += decrypt_block(b, grille, size, direction)
-    return result
+        return grille.decrypt(message)
 
 
 def show_grille(grille):
@@ -68,18 +117,19 @@ def show_grille(grille):
 # Example
 # ---------------------------
 
-size = 4
-direction = 1  # 1 = clockwise
-holes = [(0, 0), (2, 1), (2, 3), (3, 2)]  # valid 4x4 grille
+def example():
+    size = 4
+    direction = 1  # 1 = clockwise
+    holes = [(0, 0), (2, 1), (2, 3), (3, 2)]  # valid 4x4 grille
 
-message = "JIM ATTACKS AT DAWN"
-show_grille(create_grille(size, holes))
-encrypted = turning_grille(message, size, direction, 1, holes)
-decrypted = turning_grille(encrypted, size, direction, 0, holes)
+    message = "JIM ATTACKS AT DAWN"
+    show_grille(create_grille(size, holes))
+    encrypted = turning_grille(message, size, direction, 1, holes)
+    decrypted = turning_grille(encrypted, size, direction, 0, holes)
 
-print("Original message :", message)
-print("Encrypted text   :", encrypted)
-print("Decrypted text   :", decrypted)
+    print("Original message :", message)
+    print("Encrypted text   :", encrypted)
+    print("Decrypted text   :", decrypted)
 
 
 def main():
@@ -130,6 +180,8 @@ def main():
         return
 
     print(f"\nConfigured holes: {holes}")
+    for error in grille_errors(size, holes):
+        print(f"  Warning: {error}")
 
     # Show the grille
     grille = create_grille(size, holes)
@@ -161,6 +213,7 @@ def main():
 if __name__ == "__main__":
     print("=== AUTOMATIC EXAMPLE ===")
     print()
+    example()
 
     print("\n" + "=" * 50)
     main()
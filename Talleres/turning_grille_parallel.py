@@ -0,0 +1,133 @@
+"""
+Author: jpastor
+Date: 2026-10-17
+Multi-core turning grille for large documents.
+The message is copied once into shared memory as a (blocks x letters per
+block) array, already padded with X (the padding length is computed, not
+appended in a loop). Worker processes take shards of whole blocks, apply
+the grille permutation of TurningGrille with one gather per shard and write
+the result into their own rows of a preallocated shared output buffer, so
+the output is in order without joining partial results. Only shared memory
+names and row ranges are sent to the workers.
+ASCII text uses one byte per letter; any other text uses UTF-32 code points.
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+from lazy import lazy_import
+from turning_grille import TurningGrille
+
+np = lazy_import("numpy")  # loaded on first use
+
+MIN_SHARD = 1 << 20  # letters per shard; smaller shards cost more in overhead
+
+
+# ---------- PRIVATE METHODS ----------
+def _permute_rows(src_buf, dst_buf, dtype, rows, width, index, start, end) -> int:
+    """Permute rows [start, end) of the input into the output buffer."""
+    src = np.ndarray((rows, width), dtype=dtype, buffer=src_buf)
+    dst = np.ndarray((rows, len(index)), dtype=dtype, buffer=dst_buf)
+    dst[start:end] = src[start:end][:, index]
+    return end - start
+
+
+def _process_shard(args) -> int:
+    """Run one shard in a worker process, attached to the shared buffers."""
+    in_name, out_name, *shard = args
+    # Workers share the parent's resource tracker, which unlinks the segments
+    src_shm = shared_memory.SharedMemory(in_name)
+    dst_shm = shared_memory.SharedMemory(out_name)
+    try:
+        return _permute_rows(src_shm.buf, dst_shm.buf, *shard)
+    finally:
+        src_shm.close()
+        dst_shm.close()
+
+
+def _shards(rows: int, width: int, workers: int, shard_rows: int = None):
+    if shard_rows is None:
+        count = max(1, min(workers * 4, rows * width // MIN_SHARD))
+        shard_rows = -(-rows // count)
+    return [(start, min(start + shard_rows, rows)) for start in range(0, rows, shard_rows)]
+
+
+def _encode(message: str):
+    """Message as (raw bytes, numpy dtype, decoding)."""
+    if message.isascii():
+        return message.encode("ascii"), np.uint8, "ascii"
+    return message.encode("utf-32-le"), np.uint32, "utf-32-le"
+
+
+# ---------- PUBLIC METHODS ----------
+def parallel_turning_grille(
+    message: str,
+    size: int,
+    direction: int,
+    mode: int,
+    holes,
+    workers: int = None,
+    shard_rows: int = None,
+) -> str:
+    """Same result as turning_grille.turning_grille, computed across a process
+    pool. mode=1 encrypts, any other value decrypts. `shard_rows` fixes the
+    number of grille blocks per shard."""
+    grille = TurningGrille(size, holes, direction)
+    index = grille.encrypt_index if mode == 1 else grille.decrypt_index
+    message = message.replace(" ", "").upper()
+    if not message:
+        return ""
+    workers = workers or os.cpu_count() or 1
+
+    data, dtype, encoding = _encode(message)
+    width = grille.total
+    rows = -(-len(message) // width)
+    itemsize = np.dtype(dtype).itemsize
+
+    src_shm = shared_memory.SharedMemory(create=True, size=rows * width * itemsize)
+    out_size = max(1, rows * len(index) * itemsize)
+    dst_shm = shared_memory.SharedMemory(create=True, size=out_size)
+    try:
+        src = np.ndarray(rows * width, dtype=dtype, buffer=src_shm.buf)
+        src[: len(message)] = np.frombuffer(data, dtype=dtype)
+        src[len(message) :] = ord("X")  # padding up to a whole block
+        del src, data
+
+        shards = [
+            (dtype, rows, width, index, start, end)
+            for start, end in _shards(rows, width, workers, shard_rows)
+        ]
+        if workers == 1 or len(shards) == 1:
+            for shard in shards:
+                _permute_rows(src_shm.buf, dst_shm.buf, *shard)
+        else:
+            names = (src_shm.name, dst_shm.name)
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                list(pool.map(_process_shard, [names + shard for shard in shards]))
+        return bytes(dst_shm.buf[: rows * len(index) * itemsize]).decode(encoding)
+    finally:
+        for shm in (src_shm, dst_shm):
+            shm.close()
+            shm.unlink()
+
+
+def scaling_benchmark(size: int = 64 << 20, workers_list=(1, 2, 4, 8)) -> dict[int, float]:
+    """Encrypt `size` random letters with each worker count; returns MB/s."""
+    letters = np.frombuffer(b"ABCDEFGHIJKLMNOPQRSTUVWXYZ", dtype=np.uint8)
+    message = letters[np.random.default_rng(0).integers(0, 26, size)].tobytes().decode()
+    holes = [(0, 0), (2, 1), (2, 3), (3, 2)]
+    results = {}
+    for workers in workers_list:
+        start = time.perf_counter()
+        parallel_turning_grille(message, 4, 1, 1, holes, workers=workers)
+        results[workers] = size / 1e6 / (time.perf_counter() - start)
+    return results
+
+
+if __name__ == "__main__":
+    print("=== Parallel turning grille (64 MB) ===")
+    print(f"CPU cores: {os.cpu_count()}")
+    for workers, speed in scaling_benchmark().items():
+        print(f"{workers:>2} workers: {speed:8.2f} MB/s")
@@ -4,6 +4,10 @@ Date: 2025-09-14
 Vigenere Cipher Encryption and Decryption Example
 """
 
+from lazy import lazy_import
+
+np = lazy_import("numpy")  # loaded on first use
+
 
 def expand_key_with_t(key, t, length):
     # Expand the key by repeating each character t times
@@ -13,38 +17,102 @@ def expand_key_with_t(key, t, length):
     return "".join(expanded)[:length]
 
 
+class VigenereCipher:
+    def __init__(self, key, t=1):
+        """Initialize the cipher; the shift of each key character is computed once."""
+        if not key:
+            raise ValueError("Key cannot be empty")
+        if t < 1:
+            raise ValueError("The parameter t must be at least 1")
+        self.key = key
+        self.t = t
+        self.shifts = np.array([ord(k.upper()) - ord("A") for k in key]) % 26
+
+    def covers(self, length):
+        """expand_key_with_t repeats the key ceil(length / t) times, which only
+        covers the whole text when that is at least `length` characters."""
+        return len(self.key) * -(-length // self.t) >= length
+
+    def check_key_length(self, text):
+        """Raise ValueError if the expanded key leaves letters of text uncovered
+        (the expanded key may be shorter than the text when len(key) < t)."""
+        if not self.covers(len(text)):
+            covered = len(self.key) * -(-len(text) // self.t)
+            if any(ch.isalpha() for ch in text[covered:]):
+                raise ValueError("Key expanded with t is shorter than the text")
+
+    def _apply(self, data, sign, offset):
+        if isinstance(data, str):
+            if data.isascii():
+                codes = np.frombuffer(data.encode("ascii"), dtype=np.uint8)
+                return self._shift_codes(codes, sign, offset).tobytes().decode("ascii")
+            # UTF-32 keeps one array element per character
+            codes = np.frombuffer(data.encode("utf-32-le"), dtype=np.uint32)
+            out = self._shift_codes(codes, sign, offset)
+            self._shift_non_ascii(data, out, sign, offset)
+            return out.tobytes().decode("utf-32-le")
+        # bytes, bytearray and memoryview only shift ASCII letters
+        codes = np.frombuffer(data, dtype=np.uint8)
+        return self._shift_codes(codes, sign, offset).tobytes()
+
+    def _shift_codes(self, codes, sign, offset):
+        out = codes.copy()
+        for base in (ord("A"), ord("a")):
+            letters = np.flatnonzero((codes >= base) & (codes < base + 26))
+            shift = self.shifts[(offset + letters) % len(self.shifts)]
+            out[letters] = (codes[letters] - base + sign * shift) % 26 + base
+        return out
+
+    def _shift_non_ascii(self, text, out, sign, offset):
+        # Non-ASCII letters keep the original per-character arithmetic
+        for i in np.flatnonzero(out > 127):
+            char = text[i]
+            if char.isalpha():
+                base = ord("A") if char.isupper() else ord("a")
+                shift = int(self.shifts[(offset + i) % len(self.shifts)])
+                out[i] = (ord(char) - base + sign * shift) % 26 + base
+
+    def encrypt(self, text, offset=0):
+        """Encrypt a str or bytes-like object starting at key-stream position `offset`."""
+        return self._apply(text, 1, offset)
+
+    def decrypt(self, ciphertext, offset=0):
+        """Decrypt a str or bytes-like object starting at key-stream position `offset`."""
+        return self._apply(ciphertext, -1, offset)
+
+    def _stream(self, fileobj_in, fileobj_out, chunk_size, sign):
+        if len(self.key) < self.t:
+            raise ValueError("Streaming needs a key at least t characters long")
+        offset = 0
+        while True:
+            chunk = fileobj_in.read(chunk_size)
+            if not chunk:
+                break
+            fileobj_out.write(self._apply(chunk, sign, offset))
+            # The key stream continues where the previous chunk stopped
+            offset += len(chunk)
+        return offset
+
+    def encrypt_stream(self, fileobj_in, fileobj_out, chunk_size=1 << 20):
+        """Encrypt a text or binary file object chunk by chunk.
+        Returns the number of characters (or bytes) processed."""
+        return self._stream(fileobj_in, fileobj_out, chunk_size, 1)
+
+    def decrypt_stream(self, fileobj_in, fileobj_out, chunk_size=1 << 20):
+        """Decrypt a text or binary file object chunk by chunk."""
+        return self._stream(fileobj_in, fileobj_out, chunk_size, -1)
+
+
 def vigenere_encrypt(text, key, t):
-    # Expand the key to match the length of the text
-    expanded_key = expand_key_with_t(key, t, len(text))
-    result = []
-    for i, char in enumerate(text):
-        if char.isalpha():
-            # Determine if character is uppercase or lowercase
-            base = ord("A") if char.isupper() else ord("a")
-            # Calculate the shift based on the expanded key
-            shift = ord(expanded_key[i].upper()) - ord("A")
-            # Shift character and wrap around the alphabet
-            result.append(chr((ord(char) - base + shift) % 26 + base))
-        else:
-            result.append(char)
-    return "".join(result)
+    cipher = VigenereCipher(key, t)
+    cipher.check_key_length(text)
+    return cipher.encrypt(text)
 
 
 def vigenere_decrypt(ciphertext, key, t):
-    # Expand the key to match the length of the ciphertext
-    expanded_key = expand_key_with_t(key, t, len(ciphertext))
-    result = []
-    for i, char in enumerate(ciphertext):
-        if char.isalpha():
-            # Determine if character is uppercase or lowercase
-            base = ord("A") if char.isupper() else ord("a")
-            # Calculate the shift based on the expanded key
-            shift = ord(expanded_key[i].upper()) - ord("A")
-            # Reverse shift character and wrap around the alphabet
-            result.append(chr((ord(char) - base - shift) % 26 + base))
-        else:
-            result.append(char)
-    return "".join(result)
+    cipher = VigenereCipher(key, t)
+    cipher.check_key_length(ciphertext)
+    return cipher.decrypt(ciphertext)
 
 
 if __name__ == "__main__":